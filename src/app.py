@@ -1,11 +1,23 @@
 # src/app.py
+import concurrent.futures
+import os
+import time
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 
-from data_loader import load_data
-from data_processing import preprocess_data, get_employee_kpis
-from rule_based import recommend_action
+from data_loader import load_prepared_data, resolve_data_path
+from data_processing import get_employee_kpis, EmployeeIndex, build_employee_index
+from refresh import IncrementalDataset
+from shared_store import SHARED_DIR_NAME, SharedDatasetStore
+from data_cache import CACHE_DIR_NAME, SUMMARY_SIDECAR_NAME
+from kpi_stats import build_stats_snapshot
+from rule_based import recommend_action, build_relative_thresholds, evaluate_relative_masks, RELATIVE_RULE_MESSAGES
+from charts import build_figure_templates, employee_figure, gauge_figure, build_team_figures, team_figure
+from profiling import profiler
+from search_index import build_search_index
+from leaderboards import LEADERBOARDS, build_leaderboards
+from team_view import build_team_view
+from sqlite_store import SQLITE_DB_NAME, SQLiteBackend
 
 # -----------------------
 # 🔧 Streamlit Page Config
@@ -16,30 +28,236 @@ st.set_page_config(
     page_icon="📊"
 )
 
+profiler.begin_rerun()
+
 st.title("📊 Employee Attendance & Next Best Action Dashboard")
 st.markdown("Enter an Employee ID below to explore detailed KPIs and HR insights 👇")
 
 # -----------------------
 # 📥 Load & preprocess data
 # -----------------------
-@st.cache_data
-def load_and_prepare():
-    df = load_data()
+DATA_DIR = "data"
+# Opt-in compact dtypes (float32 hours, small ints, categories); see compact_frame
+COMPACT_MEMORY = os.environ.get("HORM_COMPACT_MEMORY", "0") == "1"
+# Process pool size for parsing several new exports at once (default: CPU count)
+LOAD_WORKERS = int(os.environ.get("HORM_LOAD_WORKERS", "0")) or None
+# Memory-map the dataset from a per-host store shared by all sessions and server processes
+SHARED_STORE = os.environ.get("HORM_SHARED_STORE", "1") == "1"
+# A rerun waits this long for the background refresh before painting the previous snapshot
+REFRESH_WAIT_SECONDS = 0.5
+LOADING_POLL_SECONDS = 0.25
+RULE_MODES = ["Absolute", "Relative to all employees", "Relative to account"]
+# Per-version caches keep the current and previous dataset version; older
+# indexes, snapshots and figures are evicted instead of living until restart
+VERSIONS_KEPT = 2
+# Comparison baselines (overall, billing, accounts) and team accounts with figures kept per version
+BASELINES_KEPT = 16
+TEAM_FIGURES_KEPT = 16
+# "pandas" keeps the dataset in memory; "sqlite" keeps records in an indexed on-disk
+# database and queries it per employee / cohort, for histories larger than RAM
+BACKEND = os.environ.get("HORM_BACKEND", "pandas")
+
+@st.cache_resource
+def get_dataset():
+    # Watches the data directory; each export is parsed once per content version
+    cache_dir = os.path.join(resolve_data_path(DATA_DIR), CACHE_DIR_NAME)
+    store = SharedDatasetStore(os.path.join(cache_dir, SHARED_DIR_NAME)) if SHARED_STORE else None
+    return IncrementalDataset(resolve_data_path(DATA_DIR), compact=COMPACT_MEMORY, workers=LOAD_WORKERS,
+                              store=store, summary_path=os.path.join(cache_dir, SUMMARY_SIDECAR_NAME))
+
+@st.cache_resource
+def get_sqlite_backend():
+    # One database per host, synced from the data directory like get_dataset()
+    cache_dir = os.path.join(resolve_data_path(DATA_DIR), CACHE_DIR_NAME)
+    return SQLiteBackend(os.path.join(cache_dir, SQLITE_DB_NAME), resolve_data_path(DATA_DIR))
+
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_and_prepare(version):
+    # Fallback when the data directory holds no readable exports; one shared
+    # read-only frame rather than a deserialized copy per rerun
+    profiler.record_cache_miss("load_and_prepare")
+    df = load_prepared_data(compact=COMPACT_MEMORY, status=st)
     if df.empty:
         st.error("No data available. Please check your data file.")
         return pd.DataFrame()
-    return preprocess_data(df)
+    return df
+
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_employee_index(version, _df, _kpi_table=None):
+    # Built from the incrementally merged KPI table when there is one,
+    # otherwise with one groupby; either way once per dataset version
+    profiler.record_cache_miss("load_employee_index")
+    if _kpi_table is not None:
+        return EmployeeIndex(_kpi_table)
+    return build_employee_index(_df)
+
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_stats_snapshot(version, _df):
+    # Population and cohort statistics, computed once per dataset version
+    profiler.record_cache_miss("load_stats_snapshot")
+    return build_stats_snapshot(_df)
+
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_backend_stats(version, _backend):
+    # Overall and cohort aggregates as grouped SQL queries, once per database version
+    profiler.record_cache_miss("load_backend_stats")
+    return _backend.stats_snapshot()
+
+@st.cache_resource(max_entries=VERSIONS_KEPT * 2)
+def load_relative_thresholds(version, by, _kpi_table):
+    # Percentile cutoffs per cohort over the per-employee KPI table, once per version
+    profiler.record_cache_miss("load_relative_thresholds")
+    return build_relative_thresholds(_kpi_table, by=by)
+
+@st.cache_resource(max_entries=VERSIONS_KEPT * BASELINES_KEPT)
+def load_figure_templates(version, baseline_name, _baseline_means):
+    # Chart templates per dataset version and comparison cohort
+    profiler.record_cache_miss("load_figure_templates")
+    return build_figure_templates(_baseline_means, baseline_name)
+
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_search_index(version, _kpi_table):
+    # Name / ID / account search structures, built once per dataset version
+    profiler.record_cache_miss("load_search_index")
+    return build_search_index(_kpi_table)
 
-# Load data
-df = load_and_prepare()
+@st.cache_resource(max_entries=VERSIONS_KEPT)
+def load_leaderboards(version, _kpi_table):
+    # Per-employee arrays for the welcome-page leaderboards, once per dataset version
+    profiler.record_cache_miss("load_leaderboards")
+    return build_leaderboards(_kpi_table)
 
-if df.empty:
+@st.cache_resource(max_entries=VERSIONS_KEPT * len(RULE_MODES))
+def load_team_view(version, rule_mode, _kpi_table):
+    # Per-account team aggregates under one set of recommendation rules, once per dataset version
+    profiler.record_cache_miss("load_team_view")
+    if rule_mode == "Absolute":
+        return build_team_view(_kpi_table)
+    by = 'Account code' if rule_mode == "Relative to account" else None
+    thresholds = load_relative_thresholds(version, by, _kpi_table)
+    return build_team_view(_kpi_table, evaluate_relative_masks(_kpi_table, thresholds, by), RELATIVE_RULE_MESSAGES)
+
+@st.cache_resource(max_entries=VERSIONS_KEPT * TEAM_FIGURES_KEPT)
+def load_team_figures(version, rule_mode, account, _team_view):
+    # Pre-binned team charts, once per dataset version, rule mode and account
+    profiler.record_cache_miss("load_team_figures")
+    return build_team_figures(_team_view.team(account), _team_view.bin_edges, _team_view.has_billing)
+
+def cached(loader, *args):
+    # Times a cached loader call and counts it towards its hit/miss stats
+    name = loader.__name__
+    profiler.record_cache_call(name)
+    with profiler.stage(name):
+        return loader(*args)
+
+def end_page(rerun=False):
+    # st.stop() and st.rerun() end the script early: close and export this
+    # rerun's profile record first, as the end of the page would
+    profiler.end_rerun()
+    if rerun:
+        st.rerun()
     st.stop()
 
+def show_quick_stats(employees, records, billed):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Employees", employees)
+    with col2:
+        st.metric("Total Records", records)
+    with col3:
+        st.metric("Billed Employees", billed if billed is not None else "N/A")
+
+def show_loading_page(source, refresh):
+    # First paint while the first load runs: counts from the summary sidecar
+    # of the last load and a progress bar; reruns once the data is ready
+    summary = source.cached_summary()
+    st.markdown("## 🏠 Welcome to Employee Analytics Dashboard")
+    if summary:
+        show_quick_stats(summary['employees'], summary['records'], summary['billed'])
+        if not summary['current']:
+            st.caption("Counts from the previous data load; the data files have changed since.")
+    else:
+        show_quick_stats("…", "…", "…")
+    bar = st.progress(0.0, text="⏳ Loading attendance data…")
+    while not refresh.done():
+        progress = source.progress
+        text = "⏳ Loading attendance data…"
+        if progress.phase == "parsing":
+            text = f"⏳ Parsing data files ({progress.files_done}/{progress.files_total})…"
+        elif progress.phase == "merging":
+            text = "⏳ Merging data files…"
+        bar.progress(progress.fraction, text=text)
+        time.sleep(LOADING_POLL_SECONDS)
+    end_page(rerun=True)
+
+def show_load_messages(source, changes):
+    if changes and (changes.added or changes.changed):
+        st.toast(f"🔄 Loaded {len(changes.added) + len(changes.changed)} new or updated data file(s)")
+    for path, error in list(source.errors.items()):
+        st.warning(f"⚠️ Skipped {path}: {error}")
+    for path, count in list(source.unparseable.items()):
+        st.caption(f"⚠️ {os.path.basename(path)}: {count} time/number cells could not be parsed and count as 0")
+
+backend = None
+if BACKEND == "sqlite":
+    # New or changed exports are streamed into the database in chunks on the
+    # backend's background thread; lookups and cohort aggregates below are
+    # queries against the last committed version
+    backend = source = get_sqlite_backend()
+    refresh = backend.start_sync()
+else:
+    # Load data on the dataset's background thread: only new or changed exports
+    # are parsed, and sessions arriving meanwhile share the load in flight
+    dataset = source = get_dataset()
+    refresh = dataset.start_refresh()
+# After a failed load, reruns retry in the background instead of showing the loading page again
+if not source.ready and source.last_error is None and not refresh.done():
+    show_loading_page(source, refresh)
+
+with profiler.stage("refresh"):
+    try:
+        changes = refresh.result(timeout=REFRESH_WAIT_SECONDS)
+    except concurrent.futures.TimeoutError:
+        # Still loading new exports: keep serving the previous version
+        changes = None
+        st.caption("🔄 Loading new data files in the background…")
+    except Exception as e:
+        # Failed refresh: report it and keep serving the previous version
+        changes = None
+        st.error(f"❌ Error loading data: {e}")
+show_load_messages(source, changes)
+if backend is not None:
+    version, df, kpi_table = backend.version, pd.DataFrame(columns=backend.columns), None
+else:
+    if COMPACT_MEMORY and changes and (changes.added or changes.changed):
+        memory = dataset.memory_bytes()
+        st.caption(f"🗜️ Compact layout: {memory['before'] / 1e6:.1f} MB → {memory['after'] / 1e6:.1f} MB")
+    version, df, kpi_table = dataset.snapshot()
+
+if backend is not None and backend.records:
+    employee_index = backend
+    stats = cached(load_backend_stats, version, backend)
+else:
+    if df.empty:
+        version, kpi_table = "sample", None
+        df = cached(load_and_prepare, version)
+
+    if df.empty:
+        end_page()
+
+    employee_index = cached(load_employee_index, version, df, kpi_table)
+    stats = cached(load_stats_snapshot, version, df)
+# Search, leaderboards and the team view work on the per-employee table, held
+# in memory with either backend (one row per employee)
+search_index = cached(load_search_index, version, employee_index.table)
+
 # -----------------------
 # 🔎 Employee Input
 # -----------------------
-employee_input = st.text_input("**Search by Employee ID**", placeholder="e.g., 1, 2, 3, ... (1-20 for sample data)")
+employee_input = st.text_input(
+    "**Search by Employee ID, name or account**",
+    placeholder="e.g., 1, 2, 3, ... (1-20 for sample data), a name or an account code"
+)
 
 # Helper function for safe numeric conversion
 def safe_float(value, decimals=2):
@@ -53,15 +271,33 @@ def safe_float(value, decimals=2):
 # -----------------------
 if employee_input:
     try:
-        if employee_input.isnumeric():
+        if employee_input.isnumeric() and int(employee_input) in employee_index:
             emp_id_int = int(employee_input)
-            emp_kpis = get_employee_kpis(df, emp_id_int)
-            emp_row = df[df['Employee ID'] == emp_id_int]
         else:
-            st.error("❌ Please enter a valid numeric Employee ID.")
-            st.stop()
+            # Prefix matches on ID, name words and account, then fuzzy name matches
+            with profiler.stage("search"):
+                matches = search_index.search(employee_input)
+            if not matches:
+                st.error(f"❌ No employee matches '{employee_input}'. Try IDs 1-20 for sample data.")
+                end_page()
+            match_labels = {
+                m['Employee ID']: " · ".join(
+                    str(part) for part in (m['Employee ID'], m['Employee Name'], m['Account code'])
+                    if part is not None and part == part
+                )
+                for m in matches
+            }
+            emp_id_int = st.selectbox(
+                "**Matching employees**",
+                list(match_labels),
+                format_func=match_labels.get
+            )
+
+        with profiler.stage("get_employee_kpis"):
+            emp_kpis = get_employee_kpis(df, emp_id_int, index=employee_index)
+            emp_profile = employee_index.get_profile(emp_id_int)
 
-        if not emp_kpis or emp_row.empty:
+        if not emp_kpis:
             st.error(f"❌ Employee ID {employee_input} not found. Try IDs 1-20 for sample data.")
         else:
             # -----------------------
@@ -74,15 +310,15 @@ if employee_input:
                 st.metric("**Employee ID**", emp_id_int)
             
             with col2:
-                if 'Employee Name' in emp_row.columns and not emp_row.empty:
-                    emp_name = emp_row['Employee Name'].iloc[0]
+                if 'Employee Name' in emp_profile:
+                    emp_name = emp_profile['Employee Name']
                     st.metric("**Employee Name**", emp_name)
                 else:
                     st.metric("**Employee Name**", "N/A")
             
             with col3:
-                if 'Account code' in emp_row.columns and not emp_row.empty:
-                    account_val = emp_row['Account code'].iloc[0]
+                if 'Account code' in emp_profile:
+                    account_val = emp_profile['Account code']
                     st.metric("**Account**", account_val)
                 else:
                     st.metric("**Account**", "N/A")
@@ -111,12 +347,31 @@ if employee_input:
             emp_full_leaves = safe_float(emp_kpis.get("Full Day Leave", 0))
             billed_status = "Billed" if emp_kpis.get("Billed", True) else "Unbilled"
 
-            # Calculate overall averages
-            overall_in_time = safe_float(df['Avg. In Time'].mean()) if 'Avg. In Time' in df.columns else 0
-            overall_out_time = safe_float(df['Avg. Out Time'].mean()) if 'Avg. Out Time' in df.columns else 0
-            overall_office_hrs = safe_float(df['Avg. Office Hrs'].mean()) if 'Avg. Office Hrs' in df.columns else 0
-            overall_half_leaves = safe_float(df['Half Day Leave'].mean()) if 'Half Day Leave' in df.columns else 0
-            overall_full_leaves = safe_float(df['Full Day Leave'].mean()) if 'Full Day Leave' in df.columns else 0
+            # Averages to compare against, read from the precomputed snapshot
+            comparison = st.radio(
+                "Compare against",
+                ["All employees", "Same account", "Same billing status"],
+                horizontal=True
+            )
+            with profiler.stage("baseline_stats"):
+                if comparison == "Same account" and emp_profile.get('Account code') in stats.by_account:
+                    baseline = stats.by_account[emp_profile['Account code']]
+                    baseline_label = "account avg"
+                    baseline_name = f"Account {emp_profile['Account code']} Average"
+                elif comparison == "Same billing status" and emp_kpis.get("Billed") in stats.by_billed:
+                    baseline = stats.by_billed[emp_kpis["Billed"]]
+                    baseline_label = "billing avg"
+                    baseline_name = f"{billed_status} Average"
+                else:
+                    baseline = stats.overall
+                    baseline_label = "avg"
+                    baseline_name = "Overall Average"
+
+                overall_in_time = safe_float(baseline.mean.get('Avg. In Time', 0))
+                overall_out_time = safe_float(baseline.mean.get('Avg. Out Time', 0))
+                overall_office_hrs = safe_float(baseline.mean.get('Avg. Office Hrs', 0))
+                overall_half_leaves = safe_float(baseline.mean.get('Half Day Leave', 0))
+                overall_full_leaves = safe_float(baseline.mean.get('Full Day Leave', 0))
 
             # KPI Card 1: Average In Time
             with col1:
@@ -124,7 +379,7 @@ if employee_input:
                 st.metric(
                     label="**Avg. In Time**",
                     value=f"{emp_in_time:.1f} hrs",
-                    delta=f"{delta_in_time:+.1f} hrs vs avg",
+                    delta=f"{delta_in_time:+.1f} hrs vs {baseline_label}",
                     delta_color="inverse" if delta_in_time > 0 else "normal"
                 )
 
@@ -134,7 +389,7 @@ if employee_input:
                 st.metric(
                     label="**Avg. Out Time**",
                     value=f"{emp_out_time:.1f} hrs",
-                    delta=f"{delta_out_time:+.1f} hrs vs avg",
+                    delta=f"{delta_out_time:+.1f} hrs vs {baseline_label}",
                     delta_color="normal" if delta_out_time > 0 else "inverse"
                 )
 
@@ -144,7 +399,7 @@ if employee_input:
                 st.metric(
                     label="**Avg. Office Hours**",
                     value=f"{emp_office_hrs:.1f} hrs",
-                    delta=f"{delta_office_hrs:+.1f} hrs vs avg",
+                    delta=f"{delta_office_hrs:+.1f} hrs vs {baseline_label}",
                     delta_color="normal" if delta_office_hrs > 0 else "inverse"
                 )
 
@@ -161,7 +416,7 @@ if employee_input:
                 st.metric(
                     label="**Half-Day Leaves**",
                     value=f"{int(emp_half_leaves)}",
-                    delta=f"{delta_half_leaves:+.0f} vs avg",
+                    delta=f"{delta_half_leaves:+.0f} vs {baseline_label}",
                     delta_color="inverse" if delta_half_leaves > 0 else "normal"
                 )
 
@@ -171,7 +426,7 @@ if employee_input:
                 st.metric(
                     label="**Full-Day Leaves**",
                     value=f"{int(emp_full_leaves)}",
-                    delta=f"{delta_full_leaves:+.0f} vs avg",
+                    delta=f"{delta_full_leaves:+.0f} vs {baseline_label}",
                     delta_color="inverse" if delta_full_leaves > 0 else "normal"
                 )
 
@@ -182,110 +437,28 @@ if employee_input:
             # -----------------------
             st.markdown("### 📈 Visual Analytics")
 
+            # Baseline traces and layout are cached; only the employee trace is patched
+            figures = cached(load_figure_templates, version, baseline_name, baseline.mean)
+
             # Chart 1: Attendance Hours Comparison
             st.subheader("Office Hours Comparison")
-            
-            chart1_data = pd.DataFrame({
-                'Metric': ['In Time', 'Out Time', 'Office Hours'],
-                'Employee': [emp_in_time, emp_out_time, emp_office_hrs],
-                'Overall Average': [overall_in_time, overall_out_time, overall_office_hrs]
-            })
-            
-            fig1 = go.Figure()
-            fig1.add_trace(go.Bar(
-                name=f'Employee {emp_id_int}',
-                x=chart1_data['Metric'],
-                y=chart1_data['Employee'],
-                text=chart1_data['Employee'].round(1),
-                textposition='auto',
-                marker_color='#1f77b4'
-            ))
-            fig1.add_trace(go.Bar(
-                name='Overall Average',
-                x=chart1_data['Metric'],
-                y=chart1_data['Overall Average'],
-                text=chart1_data['Overall Average'].round(1),
-                textposition='auto',
-                marker_color='#ff7f0e'
-            ))
-            
-            fig1.update_layout(
-                barmode='group',
-                height=400,
-                template='plotly_white',
-                yaxis_title='Hours',
-                showlegend=True
-            )
-            
-            st.plotly_chart(fig1, use_container_width=True)
+            with profiler.stage("plotly_render"):
+                fig1 = employee_figure(figures['office_hours'], f'Employee {emp_id_int}',
+                                       [emp_in_time, emp_out_time, emp_office_hrs])
+                st.plotly_chart(fig1, use_container_width=True)
 
             # Chart 2: Activity Hours Comparison
             st.subheader("Activity Hours Comparison")
-            
-            overall_break_hrs = safe_float(df['Avg. Break Hrs'].mean()) if 'Avg. Break Hrs' in df.columns else 0
-            overall_cafeteria_hrs = safe_float(df['Avg. Cafeteria Hrs'].mean()) if 'Avg. Cafeteria Hrs' in df.columns else 0
-            overall_ooo_hrs = safe_float(df['Avg. OOO Hrs'].mean()) if 'Avg. OOO Hrs' in df.columns else 0
-            
-            chart2_data = pd.DataFrame({
-                'Activity': ['Break Hours', 'Cafeteria Hours', 'OOO Hours'],
-                'Employee': [emp_break_hrs, emp_cafeteria_hrs, emp_ooo_hrs],
-                'Overall Average': [overall_break_hrs, overall_cafeteria_hrs, overall_ooo_hrs]
-            })
-            
-            fig2 = go.Figure()
-            fig2.add_trace(go.Bar(
-                name=f'Employee {emp_id_int}',
-                x=chart2_data['Activity'],
-                y=chart2_data['Employee'],
-                text=chart2_data['Employee'].round(1),
-                textposition='auto',
-                marker_color='#2ca02c'
-            ))
-            fig2.add_trace(go.Bar(
-                name='Overall Average',
-                x=chart2_data['Activity'],
-                y=chart2_data['Overall Average'],
-                text=chart2_data['Overall Average'].round(1),
-                textposition='auto',
-                marker_color='#d62728'
-            ))
-            
-            fig2.update_layout(
-                barmode='group',
-                height=400,
-                template='plotly_white',
-                yaxis_title='Hours',
-                showlegend=True
-            )
-            
-            st.plotly_chart(fig2, use_container_width=True)
+            with profiler.stage("plotly_render"):
+                fig2 = employee_figure(figures['activity'], f'Employee {emp_id_int}',
+                                       [emp_break_hrs, emp_cafeteria_hrs, emp_ooo_hrs])
+                st.plotly_chart(fig2, use_container_width=True)
 
             # Chart 3: Office Hours Gauge
             st.subheader("Office Hours Progress")
-            
-            fig_gauge = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=emp_office_hrs,
-                delta={'reference': 8.0},
-                gauge={
-                    'axis': {'range': [0, 12]},
-                    'bar': {'color': "darkblue"},
-                    'steps': [
-                        {'range': [0, 6], 'color': "lightcoral"},
-                        {'range': [6, 8], 'color': "lightyellow"},
-                        {'range': [8, 12], 'color': "lightgreen"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 8
-                    }
-                },
-                title={'text': "Target: 8.0 hours"}
-            ))
-            
-            fig_gauge.update_layout(height=300)
-            st.plotly_chart(fig_gauge, use_container_width=True)
+            with profiler.stage("plotly_render"):
+                fig_gauge = gauge_figure(figures['gauge'], emp_office_hrs)
+                st.plotly_chart(fig_gauge, use_container_width=True)
 
             st.markdown("---")
 
@@ -303,8 +476,21 @@ if employee_input:
                 'Full Day Leave': overall_full_leaves
             }
             
+            # Absolute rules, or standing within the population / account cohort
+            rule_mode = st.radio(
+                "Recommendation thresholds",
+                RULE_MODES,
+                horizontal=True
+            )
+            if rule_mode != "Absolute":
+                by = 'Account code' if rule_mode == "Relative to account" else None
+                thresholds = cached(load_relative_thresholds, version, by, employee_index.table)
+                overall_kpis_dict = thresholds.get(emp_profile.get('Account code'), thresholds[None]) \
+                    if by else thresholds[None]
+
             # Get recommendations
-            recommendations = recommend_action(emp_kpis, overall_kpis_dict)
+            with profiler.stage("recommend_action"):
+                recommendations = recommend_action(emp_kpis, overall_kpis_dict)
             
             # Display recommendations in a nice format
             for i, recommendation in enumerate(recommendations, 1):
@@ -321,34 +507,108 @@ else:
     st.markdown("## 🏠 Welcome to Employee Analytics Dashboard")
     
     # Display quick stats
-    col1, col2, col3 = st.columns(3)
+    show_quick_stats(
+        stats.overall.employees if 'Employee ID' in df.columns else 0,
+        stats.overall.records,
+        stats.overall.billed if 'Billed' in df.columns else None
+    )
     
+    st.markdown("---")
+
+    # -----------------------
+    # 🏆 Leaderboards
+    # -----------------------
+    st.markdown("### 🏆 Attendance Leaderboards")
+    leaderboards = cached(load_leaderboards, version, employee_index.table)
+
+    col1, col2 = st.columns([2, 1])
     with col1:
-        total_employees = len(df['Employee ID'].unique()) if 'Employee ID' in df.columns else 0
-        st.metric("Total Employees", total_employees)
-    
+        board_account = st.selectbox(
+            "Account",
+            ["All accounts"] + list(leaderboards.accounts),
+            key="leaderboard_account"
+        )
     with col2:
-        st.metric("Total Records", len(df))
-    
-    with col3:
-        if 'Billed' in df.columns:
-            if df['Billed'].dtype == bool:
-                billed_count = df['Billed'].sum()
-            else:
-                billed_count = (df['Billed'] == 'Billed').sum() if 'Billed' in df.columns else 0
-            st.metric("Billed Employees", int(billed_count))
-        else:
-            st.metric("Billed Employees", "N/A")
-    
+        board_size = st.slider("Show top", 5, 25, 10, step=5)
+
+    with profiler.stage("leaderboards"):
+        boards = leaderboards.tables(board_size, None if board_account == "All accounts" else board_account)
+    for tab, (key, _, _, _) in zip(st.tabs([title for _, title, _, _ in LEADERBOARDS]), LEADERBOARDS):
+        with tab:
+            st.dataframe(boards[key], hide_index=True, use_container_width=True)
+
+    st.markdown("---")
+
+    # -----------------------
+    # 👥 Account Team View
+    # -----------------------
+    st.markdown("### 👥 Account Team View")
+    col1, col2 = st.columns([1, 2])
+    with col2:
+        team_rule_mode = st.radio("Recommendation thresholds", RULE_MODES, horizontal=True, key="team_rule_mode")
+    team_view = cached(load_team_view, version, team_rule_mode, employee_index.table)
+    with col1:
+        team_account = st.selectbox("Account", team_view.accounts, key="team_account")
+
+    if team_account in team_view:
+        with profiler.stage("team_view"):
+            team = team_view.team(team_account)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Team Employees", team.employees)
+        with col2:
+            st.metric("Billed", team.billed if team_view.has_billing else "N/A")
+        with col3:
+            st.metric("Unbilled", team.unbilled if team_view.has_billing else "N/A")
+
+        team_means = {'Team': team.mean}
+        if team_view.has_billing:
+            team_means.update({'Billed': team.billed_mean[True], 'Unbilled': team.billed_mean[False]})
+        st.dataframe(pd.DataFrame(team_means).round(2), use_container_width=True)
+
+        # Histogram counts are pre-binned: the chart size does not grow with the team
+        team_figures = cached(load_team_figures, version, team_rule_mode, team_account, team_view)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("Recommendation rules triggered")
+            with profiler.stage("plotly_render"):
+                st.plotly_chart(team_figure(team_figures, 'rule_share'), use_container_width=True)
+        with col2:
+            st.subheader("KPI distribution")
+            team_column = st.selectbox("KPI", team_view.columns, key="team_column")
+            with profiler.stage("plotly_render"):
+                st.plotly_chart(team_figure(team_figures, team_column), use_container_width=True)
+
     st.markdown("---")
     
     # Instructions
     st.info("""
     💡 **How to use this dashboard:**
-    1. Enter an **Employee ID** in the search box above
+    1. Enter an **Employee ID**, name or account code in the search box above
     2. View detailed **KPIs and analytics** for that employee
     3. Get **HR recommendations** based on attendance patterns
     4. Compare with **overall team averages**
     
     🔍 **For sample data, try Employee IDs from 1 to 20**
-    """)
\ No newline at end of file
+    """)
+
+# -----------------------
+# ⏱️ Performance Panel (HORM_PROFILE=1)
+# -----------------------
+if profiler.enabled:
+    rerun = profiler.end_rerun()
+    with st.expander("⏱️ Performance", expanded=False):
+        st.markdown(f"**This rerun:** {rerun['rerun_seconds'] * 1000:.1f} ms")
+        st.dataframe(
+            pd.DataFrame(
+                [{'stage': name, 'ms': seconds * 1000} for name, seconds in rerun['stages'].items()]
+            ),
+            hide_index=True
+        )
+        st.markdown("**Since server start**")
+        summary = pd.DataFrame(profiler.summary())
+        if not summary.empty:
+            summary = summary[['stage', 'calls', 'mean_seconds', 'max_seconds', 'total_seconds', 'peak_bytes']]
+        st.dataframe(summary, hide_index=True)
+        st.markdown("**Cache hits / misses**")
+        st.dataframe(pd.DataFrame(profiler.cache_summary()), hide_index=True)
@@ -0,0 +1,132 @@
+# src/batch_report.py
+"""
+Headless recommendation report for every employee, for cron jobs and
+workers. Never imports Streamlit; heavy modules are imported lazily.
+
+    python src/batch_report.py data -o report.parquet --workers 4
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Below this many employees the pool start-up costs more than it saves
+PARALLEL_MIN_EMPLOYEES = 200_000
+
+@contextmanager
+def timed(timings: dict, stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = time.perf_counter() - start
+
+def _evaluate_chunk(kpis, relative, by):
+    from rule_based import evaluate_relative_masks, evaluate_rule_masks
+
+    if relative is None:
+        return evaluate_rule_masks(kpis)
+    return evaluate_relative_masks(kpis, relative, by=by)
+
+def evaluate_masks(kpis, workers: int = None, relative=None, by: str = None):
+    """
+    Rule masks for a per-employee KPI table, split across a process pool
+    when the table is large enough to pay for it
+    """
+    import numpy as np
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(kpis) < PARALLEL_MIN_EMPLOYEES:
+        return _evaluate_chunk(kpis, relative, by)
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    bounds = np.linspace(0, len(kpis), workers + 1).astype(int)
+    chunks = [kpis.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(_evaluate_chunk, chunk, relative, by) for chunk in chunks]
+        return np.concatenate([future.result() for future in futures])
+
+def build_report(source, workers: int = None, relative: str = None, use_cache: bool = True,
+                 timings: dict = None):
+    """
+    Load, preprocess, aggregate and evaluate every employee.
+    relative is None (absolute rules), 'population' or 'account'.
+    Returns (report frame, [FileLoadResult]).
+    """
+    timings = {} if timings is None else timings
+
+    with timed(timings, "load"):
+        from parallel_loader import load_many
+        df, results = load_many(source, workers=workers, use_cache=use_cache)
+
+    with timed(timings, "aggregate"):
+        from data_processing import aggregate_employee_kpis
+        kpis = aggregate_employee_kpis(df, include_profile=True) if not df.empty else None
+
+    if kpis is None:
+        return None, results
+
+    with timed(timings, "recommend"):
+        from rule_based import RELATIVE_RULE_MESSAGES, RULE_MESSAGES, build_relative_thresholds, decode_rule_mask
+
+        by = 'Account code' if relative == "account" else None
+        thresholds = build_relative_thresholds(kpis, by=by) if relative else None
+        masks = evaluate_masks(kpis, workers, thresholds, by)
+        messages = RELATIVE_RULE_MESSAGES if relative else RULE_MESSAGES
+
+        report = kpis.copy()
+        report["Rule Mask"] = masks
+        # Few distinct masks: decode each once
+        decoded = {mask: " | ".join(decode_rule_mask(mask, messages)) for mask in set(masks.tolist())}
+        report["Recommendations"] = report["Rule Mask"].map(decoded)
+
+    return report, results
+
+def write_report(report, output: str) -> None:
+    """
+    Parquet for .parquet outputs, CSV otherwise
+    """
+    if os.path.splitext(output)[1].lower() == ".parquet":
+        report.to_parquet(output, index=False)
+    else:
+        report.to_csv(output, index=False)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Write HR recommendations for every employee.")
+    parser.add_argument("source", nargs="+", help="attendance exports, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="report.parquet", help=".parquet or .csv report path")
+    parser.add_argument("--workers", type=int, default=None, help="processes for loading/evaluation (default: CPU count)")
+    parser.add_argument("--relative", choices=["population", "account"], default=None,
+                        help="percentile rules relative to all employees or to the account")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the columnar file cache")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    timings = {}
+    start = time.perf_counter()
+
+    report, results = build_report(args.source, args.workers, args.relative,
+                                   use_cache=not args.no_cache, timings=timings)
+    for result in results:
+        if not result.ok:
+            logging.warning("Skipped %s: %s", result.path, result.error)
+    if report is None:
+        logging.error("No attendance records found in %s", ", ".join(args.source))
+        return 1
+
+    with timed(timings, "write"):
+        write_report(report, args.output)
+
+    total = time.perf_counter() - start
+    stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items())
+    logging.info("Wrote %d employees from %d file(s) to %s in %.2fs (%s)",
+                 len(report), sum(result.ok for result in results), args.output, total, stages)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# src/bench_charts.py
+"""
+Per-search chart cost: rebuilding the three figures from scratch (the
+previous dashboard code) versus patching cached templates, including the
+validation and JSON serialization st.plotly_chart performs.
+
+    python src/bench_charts.py --searches 200 --users 8
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import plotly
+import plotly.graph_objects as go
+
+from charts import ACTIVITY_METRICS, OFFICE_HOURS_METRICS, build_figure_templates, employee_figure, gauge_figure
+
+BASELINE = {
+    'Avg. In Time': 9.0, 'Avg. Out Time': 18.0, 'Avg. Office Hrs': 8.5,
+    'Avg. Break Hrs': 0.5, 'Avg. Cafeteria Hrs': 0.3, 'Avg. OOO Hrs': 0.2,
+}
+
+def _serialize(figure) -> str:
+    # What st.plotly_chart does with the figure before sending it
+    figure = plotly.tools.return_figure_from_figure_or_data(figure, validate_figure=True)
+    return plotly.io.to_json(figure, validate=False)
+
+def rebuild_figures(emp_id: int, values: list) -> list:
+    """
+    The figures as the dashboard built them before templates were cached
+    """
+    figures = []
+    for metrics, employee, colors in ((OFFICE_HOURS_METRICS, values[:3], ('#1f77b4', '#ff7f0e')),
+                                      (ACTIVITY_METRICS, values[3:], ('#2ca02c', '#d62728'))):
+        data = pd.DataFrame({
+            'Metric': [label for label, _ in metrics],
+            'Employee': employee,
+            'Overall Average': [BASELINE[column] for _, column in metrics]
+        })
+        fig = go.Figure()
+        fig.add_trace(go.Bar(name=f'Employee {emp_id}', x=data['Metric'], y=data['Employee'],
+                             text=data['Employee'].round(1), textposition='auto', marker_color=colors[0]))
+        fig.add_trace(go.Bar(name='Overall Average', x=data['Metric'], y=data['Overall Average'],
+                             text=data['Overall Average'].round(1), textposition='auto', marker_color=colors[1]))
+        fig.update_layout(barmode='group', height=400, template='plotly_white',
+                          yaxis_title='Hours', showlegend=True)
+        figures.append(fig)
+    gauge = go.Figure(go.Indicator(
+        mode="gauge+number+delta", value=values[2], delta={'reference': 8.0},
+        gauge={'axis': {'range': [0, 12]}, 'bar': {'color': "darkblue"},
+               'steps': [{'range': [0, 6], 'color': "lightcoral"},
+                         {'range': [6, 8], 'color': "lightyellow"},
+                         {'range': [8, 12], 'color': "lightgreen"}],
+               'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 8}},
+        title={'text': "Target: 8.0 hours"}
+    ))
+    gauge.update_layout(height=300)
+    figures.append(gauge)
+    return figures
+
+def patched_figures(templates: dict, emp_id: int, values: list) -> list:
+    name = f'Employee {emp_id}'
+    return [
+        employee_figure(templates['office_hours'], name, values[:3]),
+        employee_figure(templates['activity'], name, values[3:]),
+        gauge_figure(templates['gauge'], values[2]),
+    ]
+
+def _search(build, emp_id: int):
+    values = [9.0 + emp_id % 7 / 10, 18.0, 8.0 + emp_id % 5 / 10, 0.5, 0.3, 0.2]
+    start = time.perf_counter()
+    payload = sum(len(_serialize(fig)) for fig in build(emp_id, values))
+    return time.perf_counter() - start, payload
+
+def run(build, searches: int, users: int) -> dict:
+    wall = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        samples = list(pool.map(lambda emp_id: _search(build, emp_id), range(searches)))
+    wall = time.perf_counter() - wall
+    latencies = sorted(seconds for seconds, _ in samples)
+    return {
+        'median_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        'searches_per_sec': searches / wall,
+        'payload_bytes': samples[0][1],
+    }
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dashboard chart rendering.")
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--users", type=int, default=8, help="concurrent searches")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    templates = build_figure_templates(BASELINE, 'Overall Average')
+    print(f"template build (once per version/cohort): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for label, build in (("rebuild", rebuild_figures),
+                         ("template", lambda emp_id, values: patched_figures(templates, emp_id, values))):
+        result = run(build, args.searches, args.users)
+        print(f"{label:>8}: median {result['median_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+              f"{result['searches_per_sec']:.0f} searches/s, {result['payload_bytes']:,} bytes per search")
+
+if __name__ == "__main__":
+    main()
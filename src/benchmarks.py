@@ -0,0 +1,207 @@
+# src/benchmarks.py
+"""
+Benchmark suite for the load -> preprocess -> KPI -> recommend pipeline on
+synthetic data. Each stage is timed (best of --repeat runs) and memory
+profiled (tracemalloc peak, in a separate run) at every size, and the
+results are written as JSON for comparison between versions.
+
+    python src/benchmarks.py --sizes 10000x1 10000x30 100000x30 -o bench.json
+    python src/benchmarks.py --sizes 10000x30 --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+from data_loader import read_prepared_file
+from data_processing import aggregate_employee_kpis, build_employee_index, get_employee_kpis, preprocess_data
+from kpi_stats import build_stats_snapshot
+from rule_based import evaluate_rule_masks, recommend_action
+from sqlite_store import SQLiteBackend
+from swipe_ingest import ingest_swipes
+from synthetic_data import generate_swipe_events, write_synthetic_csv
+
+DEFAULT_SIZES = ("1000x1", "10000x10", "100000x30")
+# Employees looked up / evaluated one by one in the per-employee stages
+SAMPLE_LOOKUPS = 200
+
+def parse_size(size: str) -> tuple:
+    """
+    'EMPLOYEESxRECORDS' -> (employees, records per employee)
+    """
+    employees, _, records = size.lower().partition("x")
+    return int(employees), int(records or 1)
+
+def measure(fn, repeat: int = 3, setup=None) -> dict:
+    """
+    Best wall time over repeat runs and the tracemalloc peak of one more
+    run; setup() (untimed) builds fn's argument for each run
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        result = fn(arg) if setup else fn()
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        result = fn(arg) if setup else fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak, "result": result}
+
+def run_size(employees: int, records: int, repeat: int, seed: int, workdir: str) -> list:
+    path = os.path.join(workdir, f"synthetic_{employees}x{records}.csv")
+    start = time.perf_counter()
+    rows = write_synthetic_csv(path, employees, records, seed=seed)
+    generate_seconds = time.perf_counter() - start
+
+    read_csv = measure(lambda: pd.read_csv(path, low_memory=False), repeat)
+    raw = read_csv.pop("result")
+
+    # The dashboard's load path: parse + preprocess + columnar cache write
+    # on a cold cache, cache read (fingerprint check included) on a warm one
+    def cold_cache():
+        shutil.rmtree(os.path.join(workdir, data_cache.CACHE_DIR_NAME), ignore_errors=True)
+        data_cache._hash_memo.clear()
+
+    load_cold = measure(lambda _: read_prepared_file(path), repeat, setup=cold_cache)
+    load_warm = measure(lambda: read_prepared_file(path), repeat)
+    preprocess = measure(preprocess_data, repeat, setup=raw.copy)
+    df = preprocess.pop("result")
+    del raw
+
+    sample = np.random.default_rng(seed).choice(df["Employee ID"].unique(), min(SAMPLE_LOOKUPS, employees),
+                                                replace=False).tolist()
+    aggregate = measure(lambda: aggregate_employee_kpis(df, include_profile=True), repeat)
+    kpis = aggregate.pop("result")
+    index = build_employee_index(df)
+
+    stages = {
+        "generate_csv": {"seconds": generate_seconds, "peak_bytes": None},
+        "read_csv": read_csv,
+        "load_cold": load_cold,
+        "load_warm": load_warm,
+        "preprocess": preprocess,
+        "aggregate": aggregate,
+        "lookup_scan": measure(lambda: [get_employee_kpis(df, emp_id) for emp_id in sample], repeat),
+        "index_build": measure(lambda: build_employee_index(df), repeat),
+        "lookup_index": measure(lambda: [get_employee_kpis(df, emp_id, index=index) for emp_id in sample], repeat),
+        "recommend_loop": measure(lambda: [recommend_action(index.get_kpis(emp_id)) for emp_id in sample], repeat),
+        "recommend_batch": measure(lambda: evaluate_rule_masks(kpis), repeat),
+        "stats_snapshot": measure(lambda: build_stats_snapshot(df), repeat),
+    }
+    # On-disk backend: chunked ingest into a fresh database (once; it re-reads
+    # the CSV), then indexed lookups and grouped cohort queries against it
+    db_path = os.path.join(workdir, f"sqlite_{employees}x{records}.db")
+
+    def fresh_backend():
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        return SQLiteBackend(db_path, path)
+
+    stages["sqlite_ingest"] = measure(lambda backend: backend.sync(), 1, setup=fresh_backend)
+    backend = SQLiteBackend(db_path, path)
+    stages["sqlite_lookup"] = measure(lambda: [backend.get_kpis(emp_id) for emp_id in sample], repeat)
+    stages["sqlite_stats"] = measure(backend.stats_snapshot, repeat)
+    del backend
+
+    # Raw badge swipes for the same employees, one working day per record
+    swipes = generate_swipe_events(employees, days=records, seed=seed)
+    stages["swipe_ingest"] = measure(lambda: ingest_swipes(swipes), repeat)
+    swipe_events = len(swipes)
+    del swipes
+
+    results = []
+    for stage, outcome in stages.items():
+        outcome.pop("result", None)
+        items = len(sample) if stage in ("lookup_scan", "lookup_index", "recommend_loop", "sqlite_lookup") else rows
+        items = swipe_events if stage == "swipe_ingest" else items
+        results.append({
+            "stage": stage,
+            "employees": employees,
+            "records_per_employee": records,
+            "rows": rows,
+            "items": items,
+            "seconds": outcome["seconds"],
+            "per_item_us": outcome["seconds"] / items * 1e6 if items else None,
+            "peak_bytes": outcome["peak_bytes"],
+        })
+    return results
+
+def environment() -> dict:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        revision = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": revision or None,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def compare(results: list, baseline_path: str) -> None:
+    """
+    Print time ratios against an earlier results file (>1 is slower)
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["stage"], r["employees"], r["records_per_employee"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path} ({baseline['environment'].get('git_revision')}):")
+    for r in results:
+        old = previous.get((r["stage"], r["employees"], r["records_per_employee"]))
+        if old and old["seconds"]:
+            print(f"  {r['stage']:<16} {r['employees']}x{r['records_per_employee']:<6} "
+                  f"{r['seconds'] / old['seconds']:.2f}x time")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the attendance pipeline on synthetic data.")
+    parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES), help="EMPLOYEESxRECORDS, e.g. 100000x30")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", default=None, help="results JSON (default: benchmark-<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    report = {"environment": environment(), "results": []}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            employees, records = parse_size(size)
+            results = run_size(employees, records, args.repeat, args.seed, workdir)
+            report["results"].extend(results)
+            for r in results:
+                peak = f"{r['peak_bytes'] / 1e6:9.1f} MB" if r["peak_bytes"] is not None else " " * 12
+                print(f"{employees}x{records:<6} {r['stage']:<16} {r['seconds']:9.4f}s {peak}", flush=True)
+
+    output = args.output or f"benchmark-{report['environment']['timestamp'].replace(':', '')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(report["results"], args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
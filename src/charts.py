@@ -0,0 +1,186 @@
+# src/charts.py
+import copy
+
+import plotly.graph_objects as go
+
+# White background and faint gridlines like 'plotly_white', without
+# shipping the full template JSON with every chart
+LIGHT_TEMPLATE = go.layout.Template(layout=dict(
+    plot_bgcolor="white",
+    paper_bgcolor="white",
+    xaxis=dict(gridcolor="#EBF0F8", zerolinecolor="#EBF0F8"),
+    yaxis=dict(gridcolor="#EBF0F8", zerolinecolor="#EBF0F8"),
+))
+
+# (axis label, KPI column) per bar group
+OFFICE_HOURS_METRICS = (
+    ("In Time", "Avg. In Time"),
+    ("Out Time", "Avg. Out Time"),
+    ("Office Hours", "Avg. Office Hrs"),
+)
+ACTIVITY_METRICS = (
+    ("Break Hours", "Avg. Break Hrs"),
+    ("Cafeteria Hours", "Avg. Cafeteria Hrs"),
+    ("OOO Hours", "Avg. OOO Hrs"),
+)
+OFFICE_HOURS_TARGET = 8.0
+
+def _value(means: dict, column: str) -> float:
+    try:
+        return round(float(means.get(column, 0)), 2)
+    except (ValueError, TypeError):
+        return 0.0
+
+def _comparison_figure(metrics, means: dict, baseline_name: str, colors) -> dict:
+    labels = [label for label, _ in metrics]
+    baseline = [_value(means, column) for _, column in metrics]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name="Employee",
+        x=labels,
+        y=[0.0] * len(labels),
+        textposition='auto',
+        marker_color=colors[0]
+    ))
+    fig.add_trace(go.Bar(
+        name=baseline_name,
+        x=labels,
+        y=baseline,
+        text=[round(value, 1) for value in baseline],
+        textposition='auto',
+        marker_color=colors[1]
+    ))
+    fig.update_layout(
+        barmode='group',
+        height=400,
+        template=LIGHT_TEMPLATE,
+        yaxis_title='Hours',
+        showlegend=True
+    )
+    return fig.to_dict()
+
+def _gauge_figure() -> dict:
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=0.0,
+        delta={'reference': OFFICE_HOURS_TARGET},
+        gauge={
+            'axis': {'range': [0, 12]},
+            'bar': {'color': "darkblue"},
+            'steps': [
+                {'range': [0, 6], 'color': "lightcoral"},
+                {'range': [6, 8], 'color': "lightyellow"},
+                {'range': [8, 12], 'color': "lightgreen"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': OFFICE_HOURS_TARGET
+            }
+        },
+        title={'text': f"Target: {OFFICE_HOURS_TARGET:.1f} hours"}
+    ))
+    fig.update_layout(height=300, template=LIGHT_TEMPLATE)
+    return fig.to_dict()
+
+def build_figure_templates(baseline_means: dict, baseline_name: str) -> dict:
+    """
+    Figure dicts with the baseline traces and layout filled in and a
+    placeholder employee trace, built once per dataset version and cohort.
+    Treat them as read-only; employee_figure/gauge_figure return patched copies.
+    Plotly validation briefly pops 'type' from trace dicts, so a template
+    must never be handed to st.plotly_chart (or shared across threads) as is.
+    """
+    return {
+        'office_hours': _comparison_figure(OFFICE_HOURS_METRICS, baseline_means, baseline_name,
+                                           ('#1f77b4', '#ff7f0e')),
+        'activity': _comparison_figure(ACTIVITY_METRICS, baseline_means, baseline_name,
+                                       ('#2ca02c', '#d62728')),
+        'gauge': _gauge_figure(),
+    }
+
+def employee_figure(template: dict, name: str, values: list) -> dict:
+    """
+    Copy of a comparison template with the employee trace set
+    """
+    figure = copy.deepcopy(template)
+    figure['data'][0].update(name=name, y=values, text=[round(value, 1) for value in values])
+    return figure
+
+def gauge_figure(template: dict, value: float) -> dict:
+    """
+    Copy of the gauge template showing value
+    """
+    figure = copy.deepcopy(template)
+    figure['data'][0]['value'] = value
+    return figure
+
+def _rule_label(message: str) -> str:
+    # "🚨 High full-day leaves detected: Schedule ..." -> "🚨 High full-day leaves detected"
+    return message.split(":", 1)[0]
+
+def team_histogram_figure(edges, counts, column: str, split_billed: bool = True) -> dict:
+    """
+    Stacked billed/unbilled bars from pre-binned counts (shape (2, nbins)):
+    one bar per bin whatever the team size
+    """
+    edges = [float(edge) for edge in edges]
+    centers = [round((lo + hi) / 2, 3) for lo, hi in zip(edges[:-1], edges[1:])]
+    width = edges[1] - edges[0] if len(edges) > 1 else 1.0
+    series = [("Billed", counts[0], '#1f77b4'), ("Unbilled", counts[1], '#ff7f0e')] if split_billed \
+        else [("Employees", counts[0] + counts[1], '#1f77b4')]
+    fig = go.Figure()
+    for name, values, color in series:
+        fig.add_trace(go.Bar(
+            name=name,
+            x=centers,
+            y=[int(count) for count in values],
+            width=width,
+            marker_color=color
+        ))
+    fig.update_layout(
+        barmode='stack',
+        bargap=0.05,
+        height=320,
+        template=LIGHT_TEMPLATE,
+        xaxis_title=column,
+        yaxis_title='Employees',
+        showlegend=True
+    )
+    return fig.to_dict()
+
+def rule_share_figure(rule_share: dict) -> dict:
+    """
+    Horizontal bars: share of the team each recommendation rule fires for
+    """
+    rules = [(message, share) for message, share in rule_share.items() if share > 0]
+    fig = go.Figure(go.Bar(
+        x=[round(share * 100, 1) for _, share in rules],
+        y=[_rule_label(message) for message, _ in rules],
+        orientation='h',
+        text=[f"{share:.0%}" for _, share in rules],
+        textposition='auto',
+        marker_color='#2ca02c'
+    ))
+    fig.update_layout(
+        height=max(250, 32 * len(rules) + 80),
+        template=LIGHT_TEMPLATE,
+        xaxis_title='% of employees',
+        yaxis=dict(autorange='reversed'),
+        showlegend=False
+    )
+    return fig.to_dict()
+
+def build_team_figures(team, bin_edges: dict, split_billed: bool = True) -> dict:
+    """
+    Rule-share and per-column histogram figure dicts of one TeamStats,
+    built once per dataset version, rule mode and account; pass copies
+    (team_figure) to st.plotly_chart
+    """
+    figures = {'rule_share': rule_share_figure(team.rule_share)}
+    for column, counts in team.histograms.items():
+        figures[column] = team_histogram_figure(bin_edges[column], counts, column, split_billed)
+    return figures
+
+def team_figure(figures: dict, key: str) -> dict:
+    return copy.deepcopy(figures[key])
@@ -0,0 +1,160 @@
+# src/data_cache.py
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+CACHE_DIR_NAME = ".cache"
+# Bump when preprocessing changes, so cached prepared frames are rebuilt
+CACHE_FORMAT_VERSION = 3
+SUMMARY_SIDECAR_NAME = "summary.json"
+
+# (path, size, mtime_ns) -> sha256, so unchanged files are hashed once per process
+_hash_memo = {}
+
+
+def _content_hash(path: str, block_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of the file contents, read in blocks
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(path: str, variant: str = "raw") -> tuple:
+    """
+    Parquet and manifest locations for a source file and cache variant
+    """
+    full_path = os.path.abspath(path)
+    directory, name = os.path.split(full_path)
+    stem = os.path.splitext(name)[0]
+    path_key = hashlib.sha1(full_path.encode("utf-8")).hexdigest()[:12]
+    cache_dir = os.path.join(directory, CACHE_DIR_NAME)
+    base = os.path.join(cache_dir, f"{stem}.{path_key}.{variant}")
+    return cache_dir, base + ".parquet", base + ".json"
+
+
+def _read_manifest(manifest_path: str) -> dict:
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(manifest_path: str, manifest: dict) -> None:
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def file_fingerprint(path: str) -> dict:
+    """
+    Identify a source file by path, size, mtime and content hash.
+    The content hash is only recomputed when size or mtime change.
+    """
+    full_path = os.path.abspath(path)
+    stat = os.stat(full_path)
+    memo_key = (full_path, stat.st_size, stat.st_mtime_ns)
+
+    sha256 = _hash_memo.get(memo_key)
+    if sha256 is None:
+        sha256 = _content_hash(full_path)
+        _hash_memo[memo_key] = sha256
+
+    return {
+        "path": full_path,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+    }
+
+
+def dataset_version(path: str) -> str:
+    """
+    Short version string that changes whenever the file contents change
+    """
+    if not os.path.exists(path):
+        return "missing"
+    return file_fingerprint(path)["sha256"][:16]
+
+
+def read_cached_frame(path: str, variant: str = "raw"):
+    """
+    Return the cached DataFrame for a source file, or None on a cache miss.
+    A touched-but-identical file (same content hash) is still a hit.
+    """
+    _, parquet_path, manifest_path = _cache_paths(path, variant)
+    manifest = _read_manifest(manifest_path)
+    if manifest.get("format") != CACHE_FORMAT_VERSION or not os.path.exists(parquet_path):
+        return None
+
+    fingerprint = file_fingerprint(path)
+    source = manifest.get("source", {})
+    if source.get("sha256") != fingerprint["sha256"] or source.get("size") != fingerprint["size"]:
+        return None
+
+    try:
+        df = pd.read_parquet(parquet_path)
+    except Exception:
+        return None
+
+    if source.get("mtime_ns") != fingerprint["mtime_ns"]:
+        # Contents unchanged, only the timestamp moved: refresh the manifest
+        manifest["source"] = fingerprint
+        _write_manifest(manifest_path, manifest)
+
+    return df
+
+
+def write_cached_frame(path: str, df: pd.DataFrame, variant: str = "raw") -> bool:
+    """
+    Store a DataFrame as the columnar cache for a source file.
+    Returns False when the frame cannot be written (e.g. pyarrow missing
+    or mixed-type object columns); callers simply run uncached then.
+    """
+    cache_dir, parquet_path, manifest_path = _cache_paths(path, variant)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = parquet_path + ".tmp"
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, parquet_path)
+    except Exception:
+        if os.path.exists(parquet_path + ".tmp"):
+            os.remove(parquet_path + ".tmp")
+        return False
+
+    _write_manifest(manifest_path, {
+        "format": CACHE_FORMAT_VERSION,
+        "variant": variant,
+        "source": file_fingerprint(path),
+        "rows": int(len(df)),
+        "columns": list(df.columns),
+    })
+    return True
+
+
+def write_summary_sidecar(path: str, summary: dict) -> bool:
+    """
+    Store a small JSON summary of the loaded dataset (counts shown before
+    the dataset itself is ready); False when the directory is not writable
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_manifest(path, dict(summary, format=CACHE_FORMAT_VERSION))
+    except OSError:
+        return False
+    return True
+
+
+def read_summary_sidecar(path: str) -> dict:
+    """
+    The stored summary, or {} when missing or of another format
+    """
+    summary = _read_manifest(path)
+    return summary if summary.get("format") == CACHE_FORMAT_VERSION else {}
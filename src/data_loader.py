@@ -1,31 +1,113 @@
 # src/data_loader.py
+import logging
 import pandas as pd
 import os
-import streamlit as st
 import numpy as np
 
-def load_data(path: str = "data/attendance_sample.xlsx") -> pd.DataFrame:
+from data_cache import dataset_version, read_cached_frame, write_cached_frame
+from data_processing import preprocess_data
+
+DEFAULT_DATA_PATH = "data/attendance_sample.xlsx"
+DATA_FILE_PATTERNS = ("*.xlsx", "*.csv")
+
+logger = logging.getLogger(__name__)
+
+class LoggingStatus:
+    """
+    Default status sink for loader messages; anything with success/warning/
+    error callables works (the dashboard passes the streamlit module)
+    """
+
+    def success(self, message):
+        logger.info(message)
+
+    def warning(self, message):
+        logger.warning(message)
+
+    def error(self, message):
+        logger.error(message)
+
+def resolve_data_path(path: str = DEFAULT_DATA_PATH) -> str:
+    """
+    Make path absolute relative to project root
+    """
+    base_dir = os.path.dirname(os.path.dirname(__file__))
+    return os.path.join(base_dir, path)
+
+def load_data(path: str = DEFAULT_DATA_PATH, status=None) -> pd.DataFrame:
     """
     Loads the attendance Excel file
     """
+    status = status or LoggingStatus()
     try:
-        # Make path absolute relative to project root
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        full_path = os.path.join(base_dir, path)
+        full_path = resolve_data_path(path)
         
         if not os.path.exists(full_path):
-            st.warning("📋 Using sample data as file not found")
+            status.warning("📋 Using sample data as file not found")
             return create_sample_data()
         
         df = pd.read_excel(full_path, engine="openpyxl")
-        st.success(f"✅ Loaded {len(df)} records from file")
+        status.success(f"✅ Loaded {len(df)} records from file")
         return df
         
     except Exception as e:
-        st.error(f"❌ Error loading data: {e}")
-        st.warning("📋 Using sample data instead")
+        status.error(f"❌ Error loading data: {e}")
+        status.warning("📋 Using sample data instead")
         return create_sample_data()
 
+def data_version(path: str = DEFAULT_DATA_PATH) -> str:
+    """
+    Content-based version of the attendance file, used as a cache key
+    """
+    return dataset_version(resolve_data_path(path))
+
+def read_prepared_file(full_path: str, use_cache: bool = True, compact: bool = False) -> pd.DataFrame:
+    """
+    Parse and preprocess one .xlsx/.csv export, through the columnar cache.
+    Errors are raised to the caller.
+    """
+    variant = "prepared-compact" if compact else "prepared"
+    if use_cache:
+        cached = read_cached_frame(full_path, variant=variant)
+        if cached is not None:
+            return cached
+
+    if os.path.splitext(full_path)[1].lower() == ".csv":
+        df = pd.read_csv(full_path)
+    else:
+        df = pd.read_excel(full_path, engine="openpyxl")
+    df = preprocess_data(df, compact=compact)
+
+    if use_cache:
+        write_cached_frame(full_path, df, variant=variant)
+    return df
+
+def load_prepared_data(path: str = DEFAULT_DATA_PATH, use_cache: bool = True,
+                       compact: bool = False, status=None) -> pd.DataFrame:
+    """
+    Loads and preprocesses the attendance file, serving repeat loads
+    from the columnar cache until the file contents change
+    """
+    status = status or LoggingStatus()
+    full_path = resolve_data_path(path)
+
+    if not (use_cache and os.path.exists(full_path)):
+        df = load_data(path, status=status)
+        return preprocess_data(df, compact=compact) if not df.empty else df
+
+    try:
+        df = read_prepared_file(full_path, compact=compact)
+    except Exception as e:
+        status.error(f"❌ Error loading data: {e}")
+        status.warning("📋 Using sample data instead")
+        return preprocess_data(create_sample_data(), compact=compact)
+
+    status.success(f"✅ Loaded {len(df)} records from file")
+    unparseable = sum(df.attrs.get('unparseable', {}).values())
+    if unparseable:
+        status.warning(f"⚠️ {unparseable} time/number cells could not be parsed and count as 0")
+    return df
+
 def create_sample_data() -> pd.DataFrame:
     """
     Create sample data for demonstration
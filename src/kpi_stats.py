@@ -0,0 +1,158 @@
+# src/kpi_stats.py
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from data_processing import KPI_MAPPINGS, full_precision
+
+# Numeric KPI columns covered by the snapshot
+STAT_COLUMNS = [col for col, agg in KPI_MAPPINGS.items() if agg != 'first']
+PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_BINS = 20
+
+@dataclass
+class CohortStats:
+    """
+    Record-level statistics for one cohort (or the whole population)
+    """
+    records: int
+    employees: int
+    billed: int
+    mean: dict = field(default_factory=dict)
+    sum: dict = field(default_factory=dict)
+    count: dict = field(default_factory=dict)
+    percentiles: dict = field(default_factory=dict)
+    histograms: dict = field(default_factory=dict)
+
+@dataclass
+class StatsSnapshot:
+    """
+    Population statistics computed once per dataset version:
+    overall, per Account code and per Billed value
+    """
+    columns: list
+    bin_edges: dict
+    overall: CohortStats
+    by_account: dict
+    by_billed: dict
+
+    def cohort(self, account=None, billed=None) -> CohortStats:
+        """
+        Stats for an account or billing cohort, falling back to overall
+        """
+        if account is not None and account in self.by_account:
+            return self.by_account[account]
+        if billed is not None and billed in self.by_billed:
+            return self.by_billed[billed]
+        return self.overall
+
+    def mean(self, column: str, account=None, billed=None) -> float:
+        return self.cohort(account, billed).mean.get(column, 0.0)
+
+def billed_mask(billed: pd.Series) -> np.ndarray:
+    """
+    Billed records, accepting bool or 'Billed'/'Unbilled' values
+    """
+    if billed.dtype == bool:
+        return billed.to_numpy()
+    if all(isinstance(value, (bool, np.bool_)) for value in pd.unique(billed)):
+        # Object column of Python bools (no NaNs)
+        return billed.to_numpy(dtype=bool)
+    return (billed == 'Billed').to_numpy(dtype=bool)
+
+def grouped_histograms(bins: np.ndarray, codes: np.ndarray, ngroups: int, nbins: int) -> np.ndarray:
+    """
+    Histogram counts per group and column from precomputed bin indexes
+    in one bincount; bin nbins collects NaNs and is dropped
+    """
+    ncols = bins.shape[1]
+    flat = (codes[:, None] * ncols + np.arange(ncols)) * (nbins + 1) + bins
+    hist = np.bincount(flat.ravel(), minlength=ngroups * ncols * (nbins + 1))
+    return hist.reshape(ngroups, ncols, nbins + 1)[:, :, :nbins]
+
+def _cohorts(values: pd.DataFrame, ids, key, bins: np.ndarray,
+             billed: np.ndarray, nbins: int) -> dict:
+    """
+    CohortStats per distinct value of key, one groupby for all columns
+    """
+    columns = list(values.columns)
+    codes, labels = pd.factorize(key, sort=True, use_na_sentinel=False)
+    ngroups = len(labels)
+    grouped = values.groupby(codes)
+    sums = grouped.sum().reindex(range(ngroups)).to_numpy()
+    counts = grouped.count().reindex(range(ngroups)).to_numpy()
+    quantiles = grouped.quantile([p / 100.0 for p in PERCENTILES])
+    quantiles = quantiles.to_numpy().reshape(ngroups, len(PERCENTILES), len(columns))
+    hist = grouped_histograms(bins, codes, ngroups, nbins)
+    records = np.bincount(codes, minlength=ngroups)
+    billed_records = np.bincount(codes, weights=billed, minlength=ngroups)
+    if ids is not None:
+        employees = ids.groupby(codes).nunique().to_numpy()
+    else:
+        employees = records
+
+    cohorts = {}
+    for k, label in enumerate(labels):
+        stats = CohortStats(
+            records=int(records[k]),
+            employees=int(employees[k]),
+            billed=int(billed_records[k]),
+        )
+        for j, col in enumerate(columns):
+            count = int(counts[k, j])
+            total = float(sums[k, j])
+            stats.mean[col] = total / count if count else 0.0
+            stats.sum[col] = total
+            stats.count[col] = count
+            stats.percentiles[col] = {p: float(quantiles[k, i, j]) for i, p in enumerate(PERCENTILES)}
+            stats.histograms[col] = hist[k, j]
+        cohorts[label] = stats
+    return cohorts
+
+def bin_columns(values: pd.DataFrame, nbins: int = HISTOGRAM_BINS) -> tuple:
+    """
+    Equal-width bin edges per column over its finite range and the bin
+    index of every value (nbins for NaN), as ({column: edges}, int64 array
+    of shape (rows, columns)). Edges are shared by all groups so their
+    histograms are comparable.
+    """
+    bin_edges = {}
+    bins = np.empty((len(values), len(values.columns)), dtype=np.int64)
+    for j, col in enumerate(values.columns):
+        column = values[col].to_numpy(dtype='float64')
+        finite = column[~np.isnan(column)]
+        low, high = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 1.0)
+        high = high if high > low else low + 1.0
+        bin_edges[col] = np.linspace(low, high, nbins + 1)
+        # Equal-width bins, so the bin index is arithmetic rather than a search
+        idx = np.clip((column - low) * (nbins / (high - low)), 0, nbins - 1)
+        idx[np.isnan(column)] = nbins
+        bins[:, j] = idx
+    return bin_edges, bins
+
+def build_stats_snapshot(df: pd.DataFrame, nbins: int = HISTOGRAM_BINS) -> StatsSnapshot:
+    """
+    Means, sums, counts, percentiles and histograms for every KPI column,
+    overall and per cohort, with one grouped aggregation per cohort key
+    """
+    columns = [col for col in STAT_COLUMNS if col in df.columns]
+    values = pd.DataFrame({col: full_precision(df[col]) for col in columns}, index=df.index)
+    ids = df['Employee ID'] if 'Employee ID' in df.columns else None
+    billed = billed_mask(df['Billed']) if 'Billed' in df.columns else np.zeros(len(df), dtype=bool)
+    bin_edges, bins = bin_columns(values, nbins)
+
+    if len(df):
+        overall = _cohorts(values, ids, np.zeros(len(df), dtype=np.int64), bins, billed, nbins)[0]
+    else:
+        overall = CohortStats(records=0, employees=0, billed=0)
+
+    return StatsSnapshot(
+        columns=columns,
+        bin_edges=bin_edges,
+        overall=overall,
+        by_account=_cohorts(values, ids, df['Account code'], bins, billed, nbins)
+        if 'Account code' in df.columns else {},
+        by_billed=_cohorts(values, ids, df['Billed'], bins, billed, nbins)
+        if 'Billed' in df.columns else {},
+    )
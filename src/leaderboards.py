@@ -0,0 +1,116 @@
+# src/leaderboards.py
+import threading
+
+import numpy as np
+import pandas as pd
+
+from rule_based import NOT_BILLED_RULE_BIT, count_rule_hits, evaluate_rule_masks
+
+RULE_HITS_COLUMN = 'Rule Hits'
+# (key, title, value column, largest first?)
+LEADERBOARDS = (
+    ("latest_arrivals", "⏰ Latest arrivals", 'Avg. In Time', True),
+    ("lowest_office_hours", "📉 Lowest office hours", 'Avg. Office Hrs', False),
+    ("most_full_day_leave", "🚨 Most full-day leave", 'Full Day Leave', True),
+    ("highest_ooo", "🏠 Highest OOO hours", 'Avg. OOO Hrs', True),
+    ("unbilled_rule_hits", "💼 Unbilled, most rule hits", RULE_HITS_COLUMN, True),
+)
+DEFAULT_TOP_N = 10
+
+def top_n(values: np.ndarray, n: int, largest: bool = True, rows: np.ndarray = None,
+          tiebreak: np.ndarray = None) -> np.ndarray:
+    """
+    Row numbers of the n largest (or smallest) non-NaN values, best first,
+    by partial selection: O(len) plus a sort of the n winners.
+    rows restricts the candidates; ties go to the lower tiebreak value.
+    """
+    candidates = np.arange(len(values)) if rows is None else rows
+    score = values[candidates].astype('float64')
+    score = -score if largest else score
+    score[np.isnan(score)] = np.inf
+    k = min(n, int(np.isfinite(score).sum()))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(score):
+        picked = np.argpartition(score, k - 1)[:k]
+        if tiebreak is not None:
+            # Values tied with the k-th go to the lowest tiebreak, again by partition
+            kth = score[picked].max()
+            better = np.flatnonzero(score < kth)
+            tied = np.flatnonzero(score == kth)
+            m = k - len(better)
+            if m < len(tied):
+                tied = tied[np.argpartition(tiebreak[candidates[tied]], m - 1)[:m]]
+            picked = np.concatenate([better, tied])
+    else:
+        picked = np.arange(len(score))
+    picked = picked[np.isfinite(score[picked])]
+    keys = (score[picked],) if tiebreak is None else (tiebreak[candidates[picked]], score[picked])
+    return candidates[picked[np.lexsort(keys)]]
+
+class LeaderboardData:
+    """
+    Per-employee arrays behind the welcome-page leaderboards, prepared once
+    per dataset version: ranked columns, rule-hit counts of unbilled
+    employees and row groups per Account code. Result tables are memoized
+    per (account, n).
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        self.ids = table['Employee ID'].to_numpy()
+        self.profile = {
+            col: table[col].to_numpy(dtype=object)
+            for col in ('Employee Name', 'Account code') if col in table.columns
+        }
+        self.values = {}
+        for _, _, column, _ in LEADERBOARDS:
+            if column in table.columns:
+                self.values[column] = pd.to_numeric(table[column], errors='coerce').to_numpy(dtype='float64')
+
+        masks = evaluate_rule_masks(table)
+        unbilled = (masks >> NOT_BILLED_RULE_BIT) & 1 == 1
+        self.values[RULE_HITS_COLUMN] = np.where(unbilled, count_rule_hits(masks), np.nan)
+
+        # Rows grouped by account: one stable sort per version, then slices
+        if 'Account code' in table.columns:
+            codes, labels = pd.factorize(table['Account code'], sort=True)
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            self.accounts = {label: order[bounds[k]:bounds[k + 1]] for k, label in enumerate(labels)}
+        else:
+            self.accounts = {}
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def leaderboard(self, key: str, n: int = DEFAULT_TOP_N, account=None) -> pd.DataFrame:
+        """
+        Top-n table for one LEADERBOARDS key, optionally within an account
+        """
+        _, _, column, largest = next(board for board in LEADERBOARDS if board[0] == key)
+        if column not in self.values:
+            return pd.DataFrame(columns=['Employee ID', column])
+        rows = self.accounts.get(account, np.empty(0, dtype=np.int64)) if account is not None else None
+        picked = top_n(self.values[column], n, largest, rows=rows, tiebreak=self.ids)
+
+        table = pd.DataFrame({'Employee ID': self.ids[picked]})
+        for col, values in self.profile.items():
+            table[col] = values[picked]
+        table[column] = self.values[column][picked]
+        if column == RULE_HITS_COLUMN:
+            table[column] = table[column].astype('int64')
+        return table
+
+    def tables(self, n: int = DEFAULT_TOP_N, account=None) -> dict:
+        """
+        {key: leaderboard table} for every board, memoized per (account, n)
+        """
+        with self._lock:
+            cached = self._tables.get((account, n))
+        if cached is None:
+            cached = {key: self.leaderboard(key, n, account) for key, _, _, _ in LEADERBOARDS}
+            with self._lock:
+                self._tables[(account, n)] = cached
+        return cached
+
+def build_leaderboards(table: pd.DataFrame) -> LeaderboardData:
+    return LeaderboardData(table)
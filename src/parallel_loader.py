@@ -0,0 +1,131 @@
+# src/parallel_loader.py
+import fnmatch
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+from data_loader import DATA_FILE_PATTERNS, read_prepared_file
+from data_processing import concat_frames
+
+@dataclass
+class FileLoadResult:
+    """
+    Outcome of loading one file in a worker
+    """
+    path: str
+    rows: int = 0
+    seconds: float = 0.0
+    error: str = None
+    unparseable: int = 0  # cells preprocess_data could not read as a time/number
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def expand_sources(source, patterns=DATA_FILE_PATTERNS) -> list:
+    """
+    Sorted file list from a directory, a glob pattern or a list of either.
+    Directories contribute files matching patterns, skipping hidden and
+    Office lock files.
+    """
+    if isinstance(source, (list, tuple)):
+        paths = []
+        for item in source:
+            paths.extend(expand_sources(item, patterns))
+        return sorted(set(paths))
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if not name.startswith((".", "~$"))
+            and any(fnmatch.fnmatch(name.lower(), pattern) for pattern in patterns)
+        )
+    return sorted(glob.glob(source))
+
+def _frame_to_payload(df: pd.DataFrame):
+    """
+    Serialize a frame as an Arrow IPC stream (columnar buffers, no
+    per-object pickling); falls back to the DataFrame itself (pickled)
+    without pyarrow or when a column has no Arrow type
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return df
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        # e.g. an object column mixing str and int, as read from a workbook
+        return df
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+def _payload_to_frame(payload) -> pd.DataFrame:
+    if isinstance(payload, pd.DataFrame):
+        return payload
+    import pyarrow as pa
+    return pa.ipc.open_stream(payload).read_all().to_pandas()
+
+def _load_worker(path: str, use_cache: bool, compact: bool, serialize: bool = True):
+    start = time.perf_counter()
+    try:
+        df = read_prepared_file(path, use_cache=use_cache, compact=compact)
+    except Exception as e:
+        return FileLoadResult(path, seconds=time.perf_counter() - start, error=f"{type(e).__name__}: {e}"), None
+    result = FileLoadResult(path, rows=len(df), seconds=time.perf_counter() - start,
+                            unparseable=sum(df.attrs.get('unparseable', {}).values()))
+    return result, _frame_to_payload(df) if serialize else df
+
+def load_files(paths: list, workers: int = None, use_cache: bool = True, compact: bool = False,
+               progress=None) -> list:
+    """
+    Parse and preprocess files across a process pool.
+    workers defaults to the CPU count; a single worker loads in-process.
+    progress, if given, is called with the number of files done so far.
+    Returns [(FileLoadResult, frame or None)] in the order of paths;
+    failures, including a dead worker, are reported in FileLoadResult.error.
+    """
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(paths)) if paths else 1
+
+    outcomes = []
+    if workers == 1:
+        for path in paths:
+            outcomes.append(_load_worker(path, use_cache, compact, serialize=False))
+            if progress is not None:
+                progress(len(outcomes))
+    else:
+        # spawn: forking the multi-threaded Streamlit server is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(_load_worker, path, use_cache, compact) for path in paths]
+            for path, future in zip(paths, futures):
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    # e.g. BrokenProcessPool after a worker died (OOM, crash in a reader);
+                    # the files still pending fail the same way and are reported too
+                    outcomes.append((FileLoadResult(path, error=f"{type(e).__name__}: {e}"), None))
+                if progress is not None:
+                    progress(len(outcomes))
+
+    return [
+        (result, _payload_to_frame(payload) if payload is not None else None)
+        for result, payload in outcomes
+    ]
+
+def load_many(source, workers: int = None, use_cache: bool = True, compact: bool = False):
+    """
+    Load every file in a directory / glob / list in parallel and merge
+    them into one frame (in sorted path order).
+    Returns (frame, [FileLoadResult]); failed files are reported, not raised.
+    """
+    loaded = load_files(expand_sources(source), workers, use_cache, compact)
+    frames = [frame for _, frame in loaded if frame is not None]
+    return concat_frames(frames), [result for result, _ in loaded]
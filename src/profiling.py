@@ -0,0 +1,244 @@
+# src/profiling.py
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+
+# HORM_PROFILE=1 turns timing on; HORM_PROFILE_MEMORY=1 adds tracemalloc peaks
+PROFILE_ENV = "HORM_PROFILE"
+PROFILE_MEMORY_ENV = "HORM_PROFILE_MEMORY"
+# Optional export targets: one JSON line per rerun / Prometheus text file
+PROFILE_JSONL_ENV = "HORM_PROFILE_JSONL"
+PROFILE_PROMETHEUS_ENV = "HORM_PROFILE_PROMETHEUS"
+
+_DISABLED = nullcontext()
+
+@dataclass
+class StageStats:
+    """
+    Cumulative timings of one instrumented stage
+    """
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+    peak_bytes: int = 0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+@dataclass
+class CacheStats:
+    """
+    Calls into a cached loader and how many of them ran its body
+    """
+    calls: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.calls - self.misses
+
+class Profiler:
+    """
+    Wall time, call counts and (optionally) peak allocation per stage, plus
+    cache hit/miss counts. Disabled, stage() returns a shared no-op context
+    and the record_* methods return immediately.
+    Memory peaks come from tracemalloc, which is process-wide: stages of
+    concurrent sessions can inflate each other's peaks.
+    """
+
+    def __init__(self, enabled: bool = False, memory: bool = False,
+                 jsonl_path: str = None, prometheus_path: str = None):
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.stages = {}   # name -> StageStats
+        self.caches = {}   # name -> CacheStats
+        self.reruns = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()  # per-session rerun record and stage stack
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        return cls(
+            enabled=os.environ.get(PROFILE_ENV, "0") == "1",
+            memory=os.environ.get(PROFILE_MEMORY_ENV, "0") == "1",
+            jsonl_path=os.environ.get(PROFILE_JSONL_ENV) or None,
+            prometheus_path=os.environ.get(PROFILE_PROMETHEUS_ENV) or None,
+        )
+
+    def stage(self, name: str):
+        """
+        Context manager timing one execution of a stage
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name: str):
+        stack = self._stack()
+        frame = self._push(stack) if self.memory else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = self._pop(stack, frame) if frame is not None else 0
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats())
+                stats.calls += 1
+                stats.total_seconds += seconds
+                stats.max_seconds = max(stats.max_seconds, seconds)
+                stats.last_seconds = seconds
+                stats.peak_bytes = max(stats.peak_bytes, peak)
+            current = getattr(self._local, "rerun", None)
+            if current is not None:
+                current[name] = current.get(name, 0.0) + seconds
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _push(self, stack: list) -> list:
+        # [allocated at entry, highest allocation seen so far]
+        size, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [size, size]
+        stack.append(frame)
+        return frame
+
+    def _pop(self, stack: list, frame: list) -> int:
+        _, peak = tracemalloc.get_traced_memory()
+        frame[1] = max(frame[1], peak)
+        stack.pop()
+        if stack:
+            # Nested stages reset the peak; hand it up to the enclosing stage
+            stack[-1][1] = max(stack[-1][1], frame[1])
+        tracemalloc.reset_peak()
+        return frame[1] - frame[0]
+
+    def record_cache_call(self, name: str) -> None:
+        """
+        Call at the call site of a cached loader
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.caches.setdefault(name, CacheStats()).calls += 1
+
+    def record_cache_miss(self, name: str) -> None:
+        """
+        Call inside the cached function body, which only runs on a miss
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.caches.setdefault(name, CacheStats()).misses += 1
+
+    def begin_rerun(self) -> None:
+        if self.enabled:
+            self._local.rerun = {}
+            self._local.rerun_start = time.perf_counter()
+
+    def end_rerun(self) -> dict:
+        """
+        Close this session's rerun record, export it and return it
+        """
+        if not self.enabled or getattr(self._local, "rerun", None) is None:
+            return {}
+        record = {
+            "timestamp": time.time(),
+            "rerun_seconds": time.perf_counter() - self._local.rerun_start,
+            "stages": self._local.rerun,
+        }
+        self._local.rerun = None
+        with self._lock:
+            self.reruns += 1
+            record["cache"] = {name: {"hits": c.hits, "misses": c.misses} for name, c in self.caches.items()}
+        if self.jsonl_path:
+            self.write_jsonl(record, self.jsonl_path)
+        if self.prometheus_path:
+            self.write_prometheus(self.prometheus_path)
+        return record
+
+    def summary(self) -> list:
+        """
+        One dict per stage with cumulative stats, slowest total first
+        """
+        with self._lock:
+            rows = [dict(stage=name, mean_seconds=stats.mean_seconds, **asdict(stats))
+                    for name, stats in self.stages.items()]
+        return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+    def cache_summary(self) -> list:
+        with self._lock:
+            return [{"cache": name, "calls": c.calls, "hits": c.hits, "misses": c.misses}
+                    for name, c in self.caches.items()]
+
+    @staticmethod
+    def write_jsonl(record: dict, path: str) -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def prometheus_text(self) -> str:
+        """
+        Cumulative stats in the Prometheus text exposition format
+        """
+        lines = [
+            "# HELP horm_stage_seconds_total Wall time spent in a dashboard stage.",
+            "# TYPE horm_stage_seconds_total counter",
+        ]
+        summary = self.summary()
+        lines += [f'horm_stage_seconds_total{{stage="{r["stage"]}"}} {r["total_seconds"]:.6f}' for r in summary]
+        lines += ["# HELP horm_stage_calls_total Executions of a dashboard stage.",
+                  "# TYPE horm_stage_calls_total counter"]
+        lines += [f'horm_stage_calls_total{{stage="{r["stage"]}"}} {r["calls"]}' for r in summary]
+        lines += ["# HELP horm_stage_max_seconds Slowest execution of a dashboard stage.",
+                  "# TYPE horm_stage_max_seconds gauge"]
+        lines += [f'horm_stage_max_seconds{{stage="{r["stage"]}"}} {r["max_seconds"]:.6f}' for r in summary]
+        if self.memory:
+            lines += ["# HELP horm_stage_peak_bytes Peak traced allocation during a stage.",
+                      "# TYPE horm_stage_peak_bytes gauge"]
+            lines += [f'horm_stage_peak_bytes{{stage="{r["stage"]}"}} {r["peak_bytes"]}' for r in summary]
+        caches = self.cache_summary()
+        lines += ["# HELP horm_cache_requests_total Cached loader calls by result.",
+                  "# TYPE horm_cache_requests_total counter"]
+        for c in caches:
+            lines.append(f'horm_cache_requests_total{{cache="{c["cache"]}",result="hit"}} {c["hits"]}')
+            lines.append(f'horm_cache_requests_total{{cache="{c["cache"]}",result="miss"}} {c["misses"]}')
+        lines += ["# HELP horm_reruns_total Completed dashboard reruns.",
+                  "# TYPE horm_reruns_total counter",
+                  f"horm_reruns_total {self.reruns}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Rewrite the textfile-collector file atomically; each write goes
+        through its own temp file, so concurrent sessions cannot interleave
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+# Process-wide profiler; module state survives Streamlit reruns
+profiler = Profiler.from_env()
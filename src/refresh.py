@@ -0,0 +1,296 @@
+# src/refresh.py
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from data_cache import CACHE_FORMAT_VERSION, file_fingerprint, read_summary_sidecar, write_summary_sidecar
+from data_loader import DATA_FILE_PATTERNS
+from data_processing import concat_frames
+from kpi_stats import billed_mask
+from parallel_loader import expand_sources, load_files
+from stream_ingest import KpiAccumulator
+
+@dataclass
+class DataChanges:
+    """
+    Files that appeared, changed or disappeared since the last scan
+    """
+    added: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+@dataclass(frozen=True)
+class RefreshProgress:
+    """
+    Phase of the running refresh ('idle', 'scanning', 'parsing',
+    'merging') and the files parsed so far
+    """
+    phase: str = "idle"
+    files_done: int = 0
+    files_total: int = 0
+
+    @property
+    def fraction(self) -> float:
+        if self.phase == "parsing" and self.files_total:
+            return 0.05 + 0.85 * self.files_done / self.files_total
+        return {"idle": 1.0, "scanning": 0.0, "merging": 0.9}.get(self.phase, 0.05)
+
+class DataDirectoryWatcher:
+    """
+    Detects new, changed and removed attendance exports in a directory.
+    Files are compared by size/mtime first and by content hash only when
+    those moved, so a scan of an unchanged directory is a few stat calls.
+    """
+
+    def __init__(self, directory: str, patterns=DATA_FILE_PATTERNS):
+        self.directory = directory
+        self.patterns = patterns
+        self.known = {}  # path -> fingerprint
+
+    def list_files(self) -> list:
+        return expand_sources(self.directory, self.patterns)
+
+    def scan(self) -> DataChanges:
+        changes = DataChanges()
+        current = {}
+        for path in self.list_files():
+            previous = self.known.get(path)
+            stat = os.stat(path)
+            if previous and (previous["size"], previous["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                current[path] = previous
+                continue
+            fingerprint = file_fingerprint(path)
+            current[path] = fingerprint
+            if previous is None:
+                changes.added.append(path)
+            elif previous["sha256"] != fingerprint["sha256"]:
+                changes.changed.append(path)
+
+        changes.removed = [path for path in self.known if path not in current]
+        self.known = current
+        return changes
+
+class IncrementalDataset:
+    """
+    Attendance data assembled from every export in a directory.
+    refresh() parses only new or changed files and folds their records
+    into the running per-employee aggregates; historical files are never
+    re-read. Only parsing and the KPI fold are incremental (appended
+    exports fold in alone): every change still rebuilds the merged frame
+    (and, with a store, republishes it), which costs O(total rows).
+    With a store, per-file frames, the merged frame and the KPI table are
+    replaced by memory-mapped copies shared with other server processes.
+    start_refresh() runs refresh() on a background thread while readers
+    keep using the previous snapshot().
+    """
+
+    def __init__(self, directory: str, use_cache: bool = True, compact: bool = False,
+                 workers: int = None, store=None, summary_path: str = None):
+        self.watcher = DataDirectoryWatcher(directory)
+        self.use_cache = use_cache
+        self.compact = compact
+        self.workers = workers  # process pool size when several files are pending
+        self.store = store      # optional SharedDatasetStore for memory-mapped frames
+        self.summary_path = summary_path  # optional JSON sidecar with the welcome-page counts
+        self.frames = {}    # path -> preprocessed frame
+        self.errors = {}    # path -> error message
+        self.unparseable = {}  # path -> cells that could not be parsed (now 0)
+        self.kpis = KpiAccumulator()
+        self.kpi_table = self.kpis.result()
+        self.frame = pd.DataFrame()
+        self.version = "empty"
+        self.progress = RefreshProgress()
+        self.ready = False  # a refresh has completed at least once
+        self.last_error = None  # message of the last failed refresh, until one succeeds
+        self._snapshot = (self.version, self.frame, self.kpi_table)
+        self._lock = threading.Lock()
+        self._future_lock = threading.Lock()
+        self._future = None
+        self._executor = None
+
+    def start_refresh(self):
+        """
+        Run refresh() on the dataset's background thread and return its
+        Future. Callers arriving while a refresh is in flight share it
+        rather than starting another.
+        """
+        with self._future_lock:
+            if self._future is None or self._future.done():
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="horm-refresh")
+                self._future = self._executor.submit(self.refresh)
+            return self._future
+
+    def refresh(self) -> DataChanges:
+        """
+        Pick up directory changes; safe to call on every page run.
+        Errors propagate and leave ready and the snapshot as they were.
+        """
+        with self._lock:
+            known = self.watcher.known
+            try:
+                changes = self._refresh()
+            except BaseException as e:
+                # Rescan the same changes next time; snapshot() still serves the previous version
+                self.watcher.known = known
+                self.last_error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self.progress = RefreshProgress()
+            self.ready = True
+            self.last_error = None
+            return changes
+
+    def _refresh(self) -> DataChanges:
+        self.progress = RefreshProgress("scanning")
+        changes = self.watcher.scan()
+        if not changes:
+            return changes
+
+        # Work on copies and replace the dataset's state only once the new
+        # snapshot is built, so a failed refresh leaves nothing half-merged
+        frames, errors, unparseable = dict(self.frames), dict(self.errors), dict(self.unparseable)
+        for path in changes.removed + changes.changed:
+            frames.pop(path, None)
+            errors.pop(path, None)
+            unparseable.pop(path, None)
+
+        pending = changes.added + changes.changed
+
+        def parsed(done):
+            self.progress = RefreshProgress("parsing", done, len(pending))
+
+        parsed(0)
+        loaded = load_files(pending, self.workers, self.use_cache, self.compact, progress=parsed)
+        self.progress = RefreshProgress("merging", len(pending), len(pending))
+        for result, frame in loaded:
+            path = result.path
+            if frame is None:
+                errors[path] = result.error
+                continue
+            if result.unparseable:
+                unparseable[path] = result.unparseable
+            frames[path] = self._share(self._file_key(path), frame=frame)["frame"]
+
+        kpis, snapshot = self._update(frames, appended_only=not (changes.changed or changes.removed),
+                                      added=changes.added)
+        if self.store is not None:
+            self.store.prune(keep={self._snapshot_key(snapshot[0])} | {self._file_key(path) for path in frames})
+        self.frames, self.errors, self.unparseable, self.kpis = frames, errors, unparseable, kpis
+        self.version, self.frame, self.kpi_table = snapshot
+        self._snapshot = snapshot
+        if self.summary_path is not None:
+            write_summary_sidecar(self.summary_path, self.summary())
+        return changes
+
+    def _update(self, frames: dict, appended_only: bool, added: list) -> tuple:
+        """
+        New KPI accumulator (only the new records folded into a copy when
+        exports are only appended) and new (version, frame, KPI table)
+        snapshot; the dataset itself is not modified. The frame is
+        concatenated from all per-file frames, a full copy proportional to
+        the dataset, whatever changed: patching the previous frame would
+        copy as much.
+        """
+        ordered = sorted(frames)
+        previous = [path for path in ordered if path not in added]
+        loaded = [path for path in sorted(added) if path in frames]
+
+        if appended_only and (not previous or (loaded and loaded[0] > previous[-1])):
+            # New exports sort after the existing ones: their records come
+            # last in the merged frame, so they fold onto the running sums
+            kpis = self.kpis.copy()
+            for path in loaded:
+                kpis.add(frames[path])
+        else:
+            # Re-fold every file's records in merged-frame order; still no file is re-read
+            kpis = KpiAccumulator()
+            for path in ordered:
+                kpis.add(frames[path])
+
+        digest = hashlib.sha256()
+        for path in ordered:
+            digest.update(f"{path}:{self.watcher.known[path]['sha256']}\n".encode("utf-8"))
+        version = digest.hexdigest()[:16] if ordered else "empty"
+
+        # Replace the merged frame and KPI table by their mapped copies
+        merged = concat_frames([frames[path] for path in ordered])
+        shared = self._share(self._snapshot_key(version), frame=merged, kpis=kpis.result())
+        return kpis, (version, shared["frame"], shared["kpis"])
+
+    def _share(self, key: str, **frames) -> dict:
+        if self.store is None or not len(frames["frame"]):
+            return frames
+        return self.store.share(key, frames)
+
+    def _file_key(self, path: str) -> str:
+        variant = "compact" if self.compact else "full"
+        return f"file-{self.watcher.known[path]['sha256'][:16]}-{variant}-v{CACHE_FORMAT_VERSION}"
+
+    def _snapshot_key(self, version: str) -> str:
+        variant = "compact" if self.compact else "full"
+        return f"snapshot-{version}-{variant}-v{CACHE_FORMAT_VERSION}"
+
+    @property
+    def files(self) -> list:
+        return sorted(self.frames)
+
+    def memory_bytes(self) -> dict:
+        """
+        Per-file 'before'/'after' bytes recorded by compact_frame, summed
+        """
+        totals = {'before': 0, 'after': 0}
+        for frame in list(self.frames.values()):
+            report = frame.attrs.get('memory_bytes', {})
+            for key in totals:
+                totals[key] += report.get(key, 0)
+        return totals
+
+    def snapshot(self) -> tuple:
+        """
+        Consistent (version, frame, per-employee KPI table) triple; does not
+        wait for a refresh in progress
+        """
+        return self._snapshot
+
+    def summary(self) -> dict:
+        """
+        Welcome-page counts of the current snapshot, with the size/mtime of
+        the files it was built from
+        """
+        version, frame, kpi_table = self._snapshot
+        billed = billed_mask(frame['Billed']).sum() if 'Billed' in frame.columns else None
+        return {
+            "version": version,
+            "employees": int(len(kpi_table)),
+            "records": int(len(frame)),
+            "billed": int(billed) if billed is not None else None,
+            "files": {path: [self.watcher.known[path]["size"], self.watcher.known[path]["mtime_ns"]]
+                      for path in sorted(self.watcher.known)},
+        }
+
+    def cached_summary(self) -> dict:
+        """
+        Summary sidecar of the last load, readable before refresh() has run;
+        'current' tells whether the files on disk are still the ones it
+        describes. {} without a sidecar.
+        """
+        summary = read_summary_sidecar(self.summary_path) if self.summary_path else {}
+        if "files" not in summary:
+            return {}
+        on_disk = {}
+        for path in self.watcher.list_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            on_disk[path] = [stat.st_size, stat.st_mtime_ns]
+        summary["current"] = on_disk == summary["files"]
+        return summary
@@ -1,9 +1,20 @@
 # rule_based.py
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from data_processing import aggregate_employee_kpis
 
 def recommend_action(emp_kpis, overall_kpis=None):
     """
-    Generate HR-focused recommendations based on employee KPIs
+    Generate HR-focused recommendations based on employee KPIs.
+    Passing RelativeThresholds as overall_kpis switches to the
+    population-relative rules (see build_relative_thresholds).
     """
+    if isinstance(overall_kpis, RelativeThresholds):
+        return recommend_relative_action(emp_kpis, overall_kpis)
+
     recommendations = []
 
     # Helper function to safely convert to float
@@ -75,4 +86,260 @@ def recommend_action(emp_kpis, overall_kpis=None):
     if not recommendations:
         recommendations.append("✅ Attendance patterns are within normal ranges. Continue regular monitoring.")
 
-    return recommendations
\ No newline at end of file
+    return recommendations
+
+# Messages in the order recommend_action emits them; bit i of a rule mask
+# corresponds to RULE_MESSAGES[i]
+RULE_MESSAGES = (
+    "🚨 High full-day leaves detected: Schedule counseling session to understand reasons",
+    "⚠️ Moderate full-day leaves: Monitor leave pattern for consistency",
+    "⚠️ Frequent half-day leaves: Discuss proper leave planning procedures",
+    "📝 Some half-day leaves: Ensure work handover during leaves",
+    "⏰ Consistently late arrivals: Discuss flexible timing options",
+    "⏰ Slightly late arrivals: Gentle reminder about office timing",
+    "🏃 Early departures: Review workload and task completion status",
+    "📉 Low office hours: Check task allocation and employee engagement",
+    "📊 Below target office hours: Monitor productivity and provide support",
+    "☕ Long break hours: Discuss time management and break policies",
+    "🍽️ Extended cafeteria time: Encourage efficient break usage",
+    "🏠 High OOO hours: Verify work-from-home arrangements",
+    "💼 Employee not billed: Review project allocation and client assignments",
+    "⭐ Excellent attendance record: Consider for recognition or rewards",
+    "✅ Attendance patterns are within normal ranges. Continue regular monitoring.",
+)
+FALLBACK_RULE_BIT = len(RULE_MESSAGES) - 1
+NOT_BILLED_RULE_BIT = 12
+# Attendance concerns (bits 0-11): not the billing, recognition or fallback messages
+CONCERN_RULE_MASK = (1 << NOT_BILLED_RULE_BIT) - 1
+
+def _safe_float(value, default=0.0):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+def _kpi_column(kpis: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Column as float64 with recommend_action's safe_float semantics
+    (missing column -> 0, unconvertible value -> 0, NaN stays NaN)
+    """
+    if column not in kpis.columns:
+        return np.zeros(len(kpis))
+    values = kpis[column]
+    if values.dtype.kind in "biuf":
+        # pd.NA in nullable columns fails float(), so it becomes the default
+        na_value = np.nan if isinstance(values.dtype, np.dtype) else 0.0
+        return values.to_numpy(dtype="float64", na_value=na_value)
+    # Mixed/object column: convert each distinct value once
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return np.array([_safe_float(v) for v in uniques], dtype="float64")[codes]
+
+def _not_billed(kpis: pd.DataFrame) -> np.ndarray:
+    """
+    Vectorized `not billed`, using Python truthiness like recommend_action
+    """
+    if "Billed" not in kpis.columns:
+        return np.zeros(len(kpis), dtype=bool)
+    values = kpis["Billed"]
+    if values.dtype.kind == "b":
+        return ~values.to_numpy(dtype=bool, na_value=True)
+    if values.dtype.kind in "iuf":
+        return values.to_numpy() == 0
+    codes, uniques = pd.factorize(values)
+    not_billed = np.array([not v for v in uniques] + [False], dtype=bool)[codes]
+    # factorize folds None into NaN, but `not None` is True and `not nan` False
+    missing = np.flatnonzero(codes == -1)
+    not_billed[missing] = [v is None for v in values.to_numpy()[missing]]
+    return not_billed
+
+def evaluate_rule_masks(kpis: pd.DataFrame) -> np.ndarray:
+    """
+    Evaluate every recommend_action rule over a per-employee KPI table
+    (see data_processing.aggregate_employee_kpis) in one vectorized pass.
+    Returns a uint16 bitmask per row; decode with decode_rule_mask.
+    """
+    full_day_leaves = _kpi_column(kpis, "Full Day Leave")
+    half_day_leaves = _kpi_column(kpis, "Half Day Leave")
+    avg_in_time = _kpi_column(kpis, "Avg. In Time")
+    avg_out_time = _kpi_column(kpis, "Avg. Out Time")
+    avg_office_hrs = _kpi_column(kpis, "Avg. Office Hrs")
+    avg_break_hrs = _kpi_column(kpis, "Avg. Break Hrs")
+    avg_cafeteria_hrs = _kpi_column(kpis, "Avg. Cafeteria Hrs")
+    avg_ooo_hrs = _kpi_column(kpis, "Avg. OOO Hrs")
+
+    # Same thresholds and if/elif exclusivity as recommend_action
+    fired = [
+        full_day_leaves > 3,
+        ~(full_day_leaves > 3) & (full_day_leaves > 1),
+        half_day_leaves > 2,
+        ~(half_day_leaves > 2) & (half_day_leaves > 1),
+        avg_in_time > 9.5,
+        ~(avg_in_time > 9.5) & (avg_in_time > 9.0),
+        avg_out_time < 17.0,
+        avg_office_hrs < 7.0,
+        ~(avg_office_hrs < 7.0) & (avg_office_hrs < 8.0),
+        avg_break_hrs > 1.0,
+        avg_cafeteria_hrs > 0.8,
+        avg_ooo_hrs > 1.5,
+        _not_billed(kpis),
+        (full_day_leaves <= 1) & (half_day_leaves <= 1) & (avg_office_hrs >= 8.0)
+        & (avg_in_time <= 9.0) & (avg_out_time >= 17.0),
+    ]
+
+    masks = np.zeros(len(kpis), dtype=np.uint16)
+    for bit, rule_mask in enumerate(fired):
+        masks |= rule_mask.astype(np.uint16) << np.uint16(bit)
+    masks[masks == 0] = 1 << FALLBACK_RULE_BIT
+    return masks
+
+def decode_rule_mask(mask, messages=RULE_MESSAGES) -> list:
+    """
+    Recommendation messages for a rule mask, in recommend_action order
+    """
+    mask = int(mask)
+    return [message for bit, message in enumerate(messages) if mask >> bit & 1]
+
+def count_rule_hits(masks: np.ndarray) -> np.ndarray:
+    """
+    Attendance-concern rules fired per rule mask (popcount of bits 0-11)
+    """
+    concerns = np.asarray(masks, dtype=np.uint16) & np.uint16(CONCERN_RULE_MASK)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(concerns)
+    bits = np.unpackbits(concerns.view(np.uint8).reshape(-1, 2), axis=1)
+    return bits.sum(axis=1).astype(np.uint8)
+
+def recommend_actions_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Recommendations for every employee in a preprocessed DataFrame.
+    Returns one row per Employee ID with its 'Rule Mask'; decode_rule_mask
+    turns a mask into the same list recommend_action would return.
+    """
+    kpis = aggregate_employee_kpis(df)
+    return pd.DataFrame({
+        "Employee ID": kpis["Employee ID"].to_numpy(),
+        "Rule Mask": evaluate_rule_masks(kpis),
+    })
+
+# Population-relative rules: (column, direction, message). 'high' fires
+# above the cohort's upper cutoff, 'low' below its lower cutoff.
+RELATIVE_RULES = (
+    ("Full Day Leave", "high", "🚨 Full-day leaves well above peers: Schedule counseling session to understand reasons"),
+    ("Half Day Leave", "high", "⚠️ Half-day leaves well above peers: Discuss proper leave planning procedures"),
+    ("Avg. In Time", "high", "⏰ Arrives later than most peers: Discuss flexible timing options"),
+    ("Avg. Out Time", "low", "🏃 Leaves earlier than most peers: Review workload and task completion status"),
+    ("Avg. Office Hrs", "low", "📉 Office hours among the lowest of peers: Check task allocation and employee engagement"),
+    ("Avg. Break Hrs", "high", "☕ Break hours among the longest of peers: Discuss time management and break policies"),
+    ("Avg. Cafeteria Hrs", "high", "🍽️ Cafeteria time among the longest of peers: Encourage efficient break usage"),
+    ("Avg. OOO Hrs", "high", "🏠 OOO hours among the highest of peers: Verify work-from-home arrangements"),
+)
+# Bit i of a relative rule mask -> RELATIVE_RULE_MESSAGES[i]
+RELATIVE_RULE_MESSAGES = tuple(message for _, _, message in RELATIVE_RULES) + (
+    RULE_MESSAGES[NOT_BILLED_RULE_BIT],
+    RULE_MESSAGES[FALLBACK_RULE_BIT],
+)
+
+@dataclass
+class RelativeThresholds:
+    """
+    Lower/upper cutoffs per KPI for one cohort (or the whole population),
+    from percentiles or mean +/- z * std of the per-employee KPI table
+    """
+    cohort: object = None
+    method: str = "percentile"
+    low: dict = field(default_factory=dict)
+    high: dict = field(default_factory=dict)
+    employees: int = 0
+
+def build_relative_thresholds(kpis: pd.DataFrame, by: str = None, method: str = "percentile",
+                              lower: float = 10, upper: float = 90, z: float = 2.0) -> dict:
+    """
+    Cutoffs for every cohort at once (one grouped quantile or mean/std
+    aggregation over the per-employee KPI table), so evaluating an employee
+    afterwards is a dictionary lookup and a few comparisons.
+    Returns {cohort label: RelativeThresholds}; key None holds the whole
+    population, which is also the only key when by is None.
+    """
+    columns = [col for col, _, _ in RELATIVE_RULES if col in kpis.columns]
+    values = pd.DataFrame({col: _kpi_column(kpis, col) for col in columns}, index=kpis.index)
+
+    def cutoffs(grouped):
+        if method == "zscore":
+            mean, std = grouped.mean(), grouped.std(ddof=0)
+            return mean - z * std, mean + z * std, grouped.count()
+        if method != "percentile":
+            raise ValueError(f"Unknown relative method: {method}")
+        q = grouped.quantile([lower / 100.0, upper / 100.0])
+        return q.xs(lower / 100.0, level=-1), q.xs(upper / 100.0, level=-1), grouped.count()
+
+    keys = {None: np.zeros(len(kpis), dtype=np.int64)}
+    if by is not None and by in kpis.columns:
+        keys[by] = kpis[by].to_numpy()
+
+    thresholds = {}
+    for name, key in keys.items():
+        codes, labels = pd.factorize(key, use_na_sentinel=False)
+        if not len(labels):
+            continue
+        low, high, count = cutoffs(values.groupby(codes))
+        for k, label in enumerate(labels):
+            cohort = None if name is None else label
+            thresholds[cohort] = RelativeThresholds(
+                cohort=cohort,
+                method=method,
+                low=low.loc[k].to_dict(),
+                high=high.loc[k].to_dict(),
+                employees=int(count.loc[k].max()) if len(columns) else 0,
+            )
+    return thresholds
+
+def recommend_relative_action(emp_kpis, thresholds: RelativeThresholds) -> list:
+    """
+    Recommendations from an employee's standing within a cohort
+    """
+    recommendations = []
+    for column, direction, message in RELATIVE_RULES:
+        if column not in thresholds.high:
+            continue
+        value = _safe_float(emp_kpis.get(column, 0))
+        if direction == "high" and value > thresholds.high[column]:
+            recommendations.append(message)
+        elif direction == "low" and value < thresholds.low[column]:
+            recommendations.append(message)
+
+    if not emp_kpis.get("Billed", True):
+        recommendations.append(RELATIVE_RULE_MESSAGES[-2])
+    if not recommendations:
+        recommendations.append(RELATIVE_RULE_MESSAGES[-1])
+    return recommendations
+
+def evaluate_relative_masks(kpis: pd.DataFrame, thresholds: dict, by: str = None) -> np.ndarray:
+    """
+    Vectorized recommend_relative_action over a per-employee KPI table:
+    each row is compared with its own cohort's cutoffs (the population's
+    when by is None or the cohort is unknown). Decode with
+    decode_rule_mask(mask, RELATIVE_RULE_MESSAGES).
+    """
+    n = len(kpis)
+    if by is not None and by in kpis.columns:
+        codes, labels = pd.factorize(kpis[by], use_na_sentinel=False)
+        cohorts = [label if label in thresholds else None for label in labels]
+    else:
+        codes, cohorts = np.zeros(n, dtype=np.int64), [None]
+
+    masks = np.zeros(n, dtype=np.uint16)
+    for bit, (column, direction, _) in enumerate(RELATIVE_RULES):
+        if column not in thresholds[None].high:
+            continue
+        side = "high" if direction == "high" else "low"
+        cutoff = np.array(
+            [getattr(thresholds[c], side)[column] for c in cohorts], dtype="float64"
+        )[codes]
+        values = _kpi_column(kpis, column)
+        fired = values > cutoff if direction == "high" else values < cutoff
+        masks |= fired.astype(np.uint16) << np.uint16(bit)
+
+    billed_bit = len(RELATIVE_RULE_MESSAGES) - 2
+    masks |= _not_billed(kpis).astype(np.uint16) << np.uint16(billed_bit)
+    masks[masks == 0] = 1 << (len(RELATIVE_RULE_MESSAGES) - 1)
+    return masks
@@ -0,0 +1,292 @@
+# src/search_index.py
+import re
+
+import numpy as np
+import pandas as pd
+
+# Sorts after every character, closing a prefix range in searchsorted
+_PREFIX_END = "\U0010ffff"
+_SPACES = re.compile(r"\s+")
+# Fuzzy matches need at least this share of trigrams in common (Jaccard)
+MIN_FUZZY_SCORE = 0.3
+DEFAULT_LIMIT = 20
+# Names per block when extracting trigrams
+TRIGRAM_BLOCK = 100_000
+# Trigrams in more than this share of the names also get a bitset, so a
+# query checks its candidates against them instead of reading the postings
+FREQUENT_TRIGRAM_SHARE = 1 / 16
+
+def normalize(text) -> str:
+    """
+    Case-folded text with runs of whitespace collapsed
+    """
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return ""
+    return _SPACES.sub(" ", str(text).casefold()).strip()
+
+def _normalized(values: pd.Series) -> pd.Series:
+    """
+    normalize() for a whole column, with vectorized string methods
+    """
+    text = values.astype("string").str.casefold()
+    return text.str.replace(r"\s+", " ", regex=True).str.strip().fillna("")
+
+def _distinct_normalized(values: np.ndarray) -> tuple:
+    """
+    Distinct normalized texts and the index of each value's text; only
+    distinct raw values are normalized, missing values become ""
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    texts = np.append(_normalized(pd.Series(uniques, dtype=object)).to_numpy(dtype=object), "")
+    # Values normalizing alike share an entry; code -1 (missing) picks the trailing ""
+    text_codes, distinct = pd.factorize(texts)
+    return np.asarray(distinct, dtype=object), text_codes[codes]
+
+def _prefix_index(keys: pd.Series, rows: np.ndarray):
+    """
+    Keys sorted for searchsorted (as Python strings) with their rows
+    """
+    order = keys.argsort(kind="stable").to_numpy()
+    return keys.to_numpy(dtype=object)[order], rows[order]
+
+def _coded_prefix_index(texts: np.ndarray, codes: np.ndarray):
+    """
+    _prefix_index() of texts[codes] for every row: only the distinct texts
+    are sorted, the rows follow by counting sort
+    """
+    rank = np.empty(len(texts), dtype=np.int64)
+    rank[pd.Series(texts, dtype="string").argsort(kind="stable").to_numpy()] = np.arange(len(texts))
+    order = _stable_order(rank[codes])
+    return texts[codes[order]], order
+
+def _prefix_rows(keys: np.ndarray, rows: np.ndarray, prefix: str, limit: int) -> np.ndarray:
+    lo = np.searchsorted(keys, prefix, side="left")
+    hi = np.searchsorted(keys, prefix + _PREFIX_END, side="left")
+    return rows[lo:min(hi, lo + limit)]
+
+def _first_occurrences(values: np.ndarray) -> np.ndarray:
+    """
+    values without repeats, in the order of their first occurrence
+    """
+    _, first = np.unique(values, return_index=True)
+    return values[np.sort(first)]
+
+def _trigram_block(names: np.ndarray):
+    padded = np.char.add(np.char.add("  ", names.astype(str)), " ")
+    width = max(int(np.char.str_len(padded).max()), 3)
+    points = np.ascontiguousarray(padded.astype(f"<U{width}")).view(np.uint32).reshape(len(padded), width)
+    points = points.astype(np.int64)
+    first, second, third = points[:, :-2], points[:, 1:-1], points[:, 2:]
+    # Characters sorted within each trigram, so an adjacent transposition
+    # ('jhon' for 'john') keeps most trigrams
+    low = np.minimum(np.minimum(first, second), third)
+    high = np.maximum(np.maximum(first, second), third)
+    codes = (low << 42) | ((first + second + third - low - high) << 21) | high
+    valid = third != 0  # the third character exists
+    rows = np.broadcast_to(np.arange(len(padded))[:, None], codes.shape)
+    return codes[valid], rows[valid]
+
+def _stable_order(keys: np.ndarray) -> np.ndarray:
+    """
+    Stable argsort of non-negative int keys below 2**32 as one or two
+    16-bit radix passes, linear in len(keys)
+    """
+    if not len(keys) or keys.max() < 1 << 16:
+        return np.argsort(keys.astype(np.uint16), kind="stable")
+    order = np.argsort((keys & 0xFFFF).astype(np.uint16), kind="stable")
+    return order[np.argsort((keys[order] >> 16).astype(np.uint16), kind="stable")]
+
+def _trigram_postings(codes: np.ndarray, rows: np.ndarray, n: int) -> tuple:
+    """
+    Trigram postings as CSR: sorted distinct codes, offsets into the rows
+    array (ascending rows per code, each row once) and the number of
+    distinct trigrams per row. Codes are factorized rather than sorted, so
+    the postings cost a hash pass and counting-sort passes.
+    """
+    ids, keys = pd.factorize(codes)
+    rank = np.argsort(keys)
+    position = np.empty_like(rank)
+    position[rank] = np.arange(len(rank))
+    ids = position[ids]
+    order = _stable_order(ids)
+    ids, rows = ids[order], rows[order]
+    # A trigram repeated within one name is posted once
+    repeated = np.r_[False, (ids[1:] == ids[:-1]) & (rows[1:] == rows[:-1])]
+    ids, rows = ids[~repeated], rows[~repeated]
+    offsets = np.r_[0, np.cumsum(np.bincount(ids, minlength=len(keys)))]
+    # Per-row counts in the smallest dtype that holds them: queries gather them at random
+    counts = np.bincount(rows, minlength=n)
+    return keys[rank], offsets, rows, counts.astype(np.min_scalar_type(counts.max() if n else 0))
+
+def _trigram_codes(names: np.ndarray, block: int = TRIGRAM_BLOCK):
+    """
+    Integer code of every padded trigram of every name (its characters in
+    sorted order), with its row. Characters are read as UTF-32 code points
+    (21 bits), so three fit in an int64; names go in blocks to bound the
+    fixed-width scratch arrays.
+    """
+    codes, rows = [np.empty(0, np.int64)], [np.empty(0, np.int64)]
+    for start in range(0, len(names), block):
+        c, r = _trigram_block(names[start:start + block])
+        codes.append(c)
+        rows.append(r + start)
+    return np.concatenate(codes), np.concatenate(rows)
+
+class SearchIndex:
+    """
+    Type-ahead search over employees by ID, name and account code, built
+    once per dataset version from a per-employee table (one row each).
+    Prefix lookups are binary searches over sorted normalized keys (names
+    are also indexed from each word, so 'smi' finds 'John Smith'); fuzzy
+    lookups score names by trigrams shared with the query.
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        self.ids = table["Employee ID"].to_numpy()
+        self.names = table["Employee Name"].to_numpy(dtype=object) if "Employee Name" in table.columns \
+            else np.full(len(table), None, dtype=object)
+        self.accounts = table["Account code"].to_numpy(dtype=object) if "Account code" in table.columns \
+            else np.full(len(table), None, dtype=object)
+        rows = np.arange(len(table))
+
+        self.id_keys, self.id_rows = _prefix_index(table["Employee ID"].astype("string"), rows)
+        self.account_keys, self.account_rows = _coded_prefix_index(*_distinct_normalized(self.accounts))
+
+        # Names are indexed once per distinct normalized name; a match
+        # expands to the rows holding it (CSR: name -> ascending rows)
+        texts, name_codes = _distinct_normalized(self.names)
+        self.name_members = _stable_order(name_codes)
+        self.name_offsets = np.r_[0, np.cumsum(np.bincount(name_codes, minlength=len(texts)))]
+
+        # Every word start of a name as its own key
+        names = pd.Series(texts, dtype="string")
+        ids = np.arange(len(texts))
+        word_keys, word_ids = [names], [ids]
+        rest, rest_ids = names, ids
+        while len(rest):
+            rest = rest.str.replace(r"^\S+ ?", "", n=1, regex=True)
+            keep = (rest != "").to_numpy()
+            rest, rest_ids = rest[keep], rest_ids[keep]
+            word_keys.append(rest)
+            word_ids.append(rest_ids)
+        self.name_keys, self.name_ids = _prefix_index(
+            pd.concat(word_keys, ignore_index=True), np.concatenate(word_ids)
+        )
+
+        codes, code_names = _trigram_codes(texts)
+        self.trigram_codes, self.trigram_offsets, self.trigram_names, self.trigram_counts = \
+            _trigram_postings(codes, code_names, len(texts))
+        lengths = np.diff(self.trigram_offsets)
+        frequent = np.flatnonzero(lengths > max(FREQUENT_TRIGRAM_SHARE * len(texts), 1))
+        self.trigram_bitset = np.full(len(lengths), -1)
+        self.trigram_bitset[frequent] = np.arange(len(frequent))
+        self.bitsets = np.zeros((len(frequent), (len(texts) + 7) // 8), dtype=np.uint8)
+        for bitset, trigram in zip(self.bitsets, frequent):
+            members = np.zeros(len(texts), dtype=bool)
+            members[self.trigram_names[self.trigram_offsets[trigram]:self.trigram_offsets[trigram + 1]]] = True
+            bitset[:] = np.packbits(members, bitorder="little")
+
+    def _rows_of_names(self, names: np.ndarray, limit: int) -> np.ndarray:
+        """
+        Rows holding the given distinct names, in that order, up to limit
+        """
+        rows, total = [np.empty(0, dtype=np.int64)], 0
+        for name in names.tolist():
+            members = self.name_members[self.name_offsets[name]:self.name_offsets[name + 1]][:limit - total]
+            rows.append(members)
+            total += len(members)
+            if total >= limit:
+                break
+        return np.concatenate(rows)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def prefix(self, query: str, limit: int = DEFAULT_LIMIT) -> np.ndarray:
+        """
+        Up to limit rows whose ID, a name word or account code starts with
+        query, in that order of precedence and without duplicates
+        """
+        text = normalize(query)
+        if not text:
+            return np.empty(0, dtype=np.int64)
+        found = np.concatenate([
+            _prefix_rows(self.id_keys, self.id_rows, text, limit),
+            self._rows_of_names(_first_occurrences(_prefix_rows(self.name_keys, self.name_ids, text, limit)), limit),
+            _prefix_rows(self.account_keys, self.account_rows, text, limit),
+        ])
+        return _first_occurrences(found)[:limit]
+
+    def fuzzy(self, query: str, limit: int = DEFAULT_LIMIT, min_score: float = MIN_FUZZY_SCORE) -> np.ndarray:
+        """
+        Rows whose names share the most trigrams with query, best first
+        """
+        text = normalize(query)
+        if not text or not len(self.trigram_codes):
+            return np.empty(0, dtype=np.int64)
+        query_codes, _ = _trigram_codes(np.array([text], dtype=object))
+        query_codes = np.unique(query_codes)
+        slot = np.searchsorted(self.trigram_codes, query_codes).clip(max=len(self.trigram_codes) - 1)
+        found = self.trigram_codes[slot] == query_codes
+        lo = np.where(found, self.trigram_offsets[slot], 0)
+        hi = np.where(found, self.trigram_offsets[slot + 1], 0)
+
+        if not (hi > lo).any():
+            return np.empty(0, dtype=np.int64)
+
+        # Candidates are the names in the posting lists of the query's
+        # trigrams that are not frequent (or in the shortest list when all
+        # are), counted per name; frequent trigrams, capped by their bitsets,
+        # only add to the count of those names. A name sharing nothing but
+        # frequent trigrams with the query is not found.
+        needed = max(int(np.ceil(min_score * len(query_codes))), 1)
+        frequent = found & (self.trigram_bitset[slot] >= 0)
+        counted = np.flatnonzero(found & ~frequent)
+        if not len(counted):
+            counted = np.argsort(hi - lo + (hi == lo) * len(self.trigram_names), kind="stable")[:1]
+        counts = np.zeros(len(self.trigram_counts), dtype=np.uint8 if len(query_codes) < 256 else np.uint16)
+        for i in counted:
+            # Each name is posted once per trigram: a plain fancy add is exact
+            counts[self.trigram_names[lo[i]:hi[i]]] += 1
+        candidates = np.flatnonzero(counts.view(bool)) if counts.itemsize == 1 else np.flatnonzero(counts)
+        shared = counts[candidates]
+        checked = np.flatnonzero(frequent)
+        checked = checked[~np.isin(checked, counted)]
+        if len(checked):
+            byte, bit = candidates >> 3, (candidates & 7).astype(shared.dtype)
+            for i in checked:
+                shared += (self.bitsets[self.trigram_bitset[slot[i]]][byte] >> bit) & 1
+        keep = shared >= needed
+        candidates, shared = candidates[keep], shared[keep].astype(np.float32)
+        score = shared / (len(query_codes) + self.trigram_counts[candidates] - shared)
+        keep = score >= min_score
+        candidates, score = candidates[keep], score[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-score, limit)[:limit]
+            candidates, score = candidates[top], score[top]
+        return self._rows_of_names(candidates[np.argsort(-score, kind="stable")], limit)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list:
+        """
+        Up to limit matches, prefix matches first, topped up with fuzzy
+        name matches: [{'Employee ID', 'Employee Name', 'Account code', 'match'}]
+        """
+        rows = self.prefix(query, limit)
+        kinds = ["prefix"] * len(rows)
+        if len(rows) < limit:
+            extra = self.fuzzy(query, limit)
+            extra = extra[~np.isin(extra, rows)][:limit - len(rows)]
+            rows = np.concatenate([rows, extra])
+            kinds += ["fuzzy"] * len(extra)
+        return [
+            {
+                "Employee ID": self.ids[row].item() if hasattr(self.ids[row], "item") else self.ids[row],
+                "Employee Name": self.names[row],
+                "Account code": self.accounts[row],
+                "match": kind,
+            }
+            for row, kind in zip(rows.tolist(), kinds)
+        ]
+
+def build_search_index(table: pd.DataFrame) -> SearchIndex:
+    return SearchIndex(table)
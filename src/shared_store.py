@@ -0,0 +1,175 @@
+# src/shared_store.py
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+SHARED_DIR_NAME = "shared"
+STORE_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# Entries not used for this long may be removed by prune()
+PRUNE_AFTER_SECONDS = 3600
+_INDEX_COLUMN = "__index__"
+_METADATA_KEY = b"horm"
+
+def frame_to_table(df: pd.DataFrame):
+    """
+    Arrow table whose columns map back to pandas without a copy: floats
+    keep NaN as a value (not an Arrow null) and bools are stored as uint8.
+    A non-default index is kept as an extra column.
+    """
+    import pyarrow as pa
+
+    columns, names, bools = [], [], []
+    index = df.index
+    if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+        columns.append(pa.array(index.to_numpy()))
+        names.append(_INDEX_COLUMN)
+    for name in df.columns:
+        values = df[name]
+        if values.dtype == bool:
+            columns.append(pa.array(values.to_numpy().view(np.uint8)))
+            bools.append(name)
+        elif values.dtype.kind in "iuf":
+            columns.append(pa.array(values.to_numpy()))
+        else:
+            columns.append(pa.array(values))
+        names.append(str(name))
+
+    metadata = {"bool_columns": bools, "attrs": df.attrs}
+    return pa.table(columns, names=names, metadata={_METADATA_KEY: json.dumps(metadata, default=str)})
+
+def table_to_frame(table) -> pd.DataFrame:
+    """
+    Inverse of frame_to_table; numeric, string and categorical columns
+    reference the table's buffers (read-only when the table is mapped)
+    """
+    metadata = json.loads((table.schema.metadata or {}).get(_METADATA_KEY, b"{}"))
+    df = table.to_pandas(split_blocks=True)
+    for name in metadata.get("bool_columns", []):
+        df[name] = pd.Series(df[name].to_numpy().view(bool), index=df.index, name=name, copy=False)
+    if _INDEX_COLUMN in df.columns:
+        df.index = pd.Index(df[_INDEX_COLUMN].to_numpy(), copy=False)
+        df = df.drop(columns=_INDEX_COLUMN)
+    df.attrs = metadata.get("attrs", {})
+    return df
+
+class SharedDatasetStore:
+    """
+    Read-only DataFrames shared by every session and every server process
+    on a host. Each key (a dataset version) is published once as a
+    directory of uncompressed Arrow IPC files, written under a temporary
+    name and renamed into place, so readers see either nothing or the
+    complete version. Readers memory-map the files: the pages live in the
+    OS page cache once, however many sessions or processes use them, and
+    opening a version costs no deserialization.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.path(key), MANIFEST_NAME))
+
+    def publish(self, key: str, frames: dict) -> bool:
+        """
+        Write {name: DataFrame} under key unless it is already published.
+        Returns False when the frames cannot be written (e.g. pyarrow
+        missing or mixed-type object columns); callers keep their own copy.
+        """
+        if key in self:
+            return True
+        tmp_dir = os.path.join(self.root, f".{key}.{os.getpid()}.tmp")
+        try:
+            import pyarrow as pa
+
+            os.makedirs(tmp_dir, exist_ok=True)
+            manifest = {"format": STORE_FORMAT_VERSION, "key": key, "created": time.time(), "frames": {}}
+            for name, df in frames.items():
+                table = frame_to_table(df)
+                with pa.OSFile(os.path.join(tmp_dir, f"{name}.arrow"), "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                manifest["frames"][name] = {"rows": int(len(df)), "columns": [str(c) for c in df.columns]}
+            with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as fh:
+                json.dump(manifest, fh, indent=2)
+            os.rename(tmp_dir, self.path(key))
+        except OSError:
+            # Another process renamed the same key into place first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return key in self
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+        return True
+
+    def open(self, key: str):
+        """
+        {name: DataFrame} memory-mapped from a published key, or None
+        """
+        directory = self.path(key)
+        try:
+            import pyarrow as pa
+
+            with open(os.path.join(directory, MANIFEST_NAME), "r", encoding="utf-8") as fh:
+                manifest = json.load(fh)
+            if manifest.get("format") != STORE_FORMAT_VERSION:
+                return None
+            frames = {}
+            for name in manifest["frames"]:
+                source = pa.memory_map(os.path.join(directory, f"{name}.arrow"))
+                frames[name] = table_to_frame(pa.ipc.open_file(source).read_all())
+            os.utime(directory)  # last use, for prune()
+        except Exception:
+            return None
+        return frames
+
+    def share(self, key: str, frames: dict) -> dict:
+        """
+        Publish frames under key if needed and return the mapped copies;
+        falls back to the frames given when the store is unusable
+        """
+        if self.publish(key, frames):
+            mapped = self.open(key)
+            if mapped is not None:
+                return mapped
+        return frames
+
+    def prune(self, keep=(), max_age: float = PRUNE_AFTER_SECONDS) -> list:
+        """
+        Remove keys outside keep that were not used for max_age seconds.
+        Processes still mapping a removed key keep their pages (POSIX).
+        """
+        removed = []
+        now = time.time()
+        try:
+            entries = os.listdir(self.root)
+        except OSError:
+            return removed
+        for entry in entries:
+            path = os.path.join(self.root, entry)
+            try:
+                idle = now - os.stat(path).st_mtime
+            except OSError:
+                continue
+            if entry in keep or idle < max_age:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(entry)
+        return removed
+
+    def mapped_bytes(self, key: str) -> int:
+        """
+        On-disk (and, once touched, page-cache) size of a published key
+        """
+        directory = self.path(key)
+        try:
+            return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        except OSError:
+            return 0
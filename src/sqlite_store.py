@@ -0,0 +1,394 @@
+# src/sqlite_store.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from data_cache import CACHE_FORMAT_VERSION
+from data_processing import KPI_MAPPINGS, PROFILE_COLUMNS
+from kpi_stats import STAT_COLUMNS, CohortStats, StatsSnapshot
+from refresh import DataChanges, DataDirectoryWatcher, RefreshProgress
+from stream_ingest import DEFAULT_CHUNKSIZE, iter_preprocessed_chunks
+
+SQLITE_DB_NAME = "attendance.sqlite"
+# Bump when the table layout changes; preprocessing changes bump CACHE_FORMAT_VERSION
+SQLITE_FORMAT_VERSION = 2
+# Columns stored per record; anything else in an export is dropped
+RECORD_COLUMNS = ['Employee ID'] + PROFILE_COLUMNS + list(KPI_MAPPINGS)
+# Rows per file stay below this, so rank * ROW_SPAN + row_no orders every record
+ROW_SPAN = 1 << 40
+INDEXES = {
+    'records_employee': "CREATE INDEX IF NOT EXISTS records_employee ON records (\"Employee ID\")",
+    'records_account': "CREATE INDEX IF NOT EXISTS records_account ON records (\"Account code\")",
+    'records_file': "CREATE INDEX IF NOT EXISTS records_file ON records (file_id)",
+}
+
+def _quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+def _schema() -> list:
+    hour_or_leave = [col for col, agg in KPI_MAPPINGS.items() if agg != 'first']
+    columns = ", ".join(
+        f"{_quote(col)} {'REAL' if col in hour_or_leave else 'INTEGER' if col == 'Employee ID' else ''}".rstrip()
+        for col in RECORD_COLUMNS
+    )
+    return [
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+        "CREATE TABLE IF NOT EXISTS files (file_id INTEGER PRIMARY KEY, path TEXT UNIQUE, sha256 TEXT, "
+        "rank INTEGER, rows INTEGER, unparseable INTEGER, columns TEXT, bool_columns TEXT)",
+        f"CREATE TABLE IF NOT EXISTS records (file_id INTEGER, row_no INTEGER, {columns})",
+    ] + list(INDEXES.values())
+
+class SQLiteBackend:
+    """
+    Attendance records of every export in a directory, kept in an on-disk
+    SQLite database indexed on Employee ID and Account code instead of one
+    in-memory DataFrame. Employee lookups and cohort aggregates run as SQL
+    (indexed where they filter), so memory grows with the number of
+    employees, not of records. Stands in for EmployeeIndex (get_kpis,
+    get_profile, `in`, table) and build_stats_snapshot().
+    The per-employee table (search, leaderboards, team view) is still
+    materialized in pandas: one row per employee must fit in RAM.
+    sync() ingests new or changed files chunk by chunk in one transaction
+    (a savepoint per file, so a bad file is skipped alone); readers keep
+    seeing the previous version until it commits. start_sync() runs it
+    on a background thread, like IncrementalDataset.start_refresh().
+    """
+
+    def __init__(self, db_path: str, directory: str, chunksize: int = DEFAULT_CHUNKSIZE):
+        self.db_path = db_path
+        self.watcher = DataDirectoryWatcher(directory)
+        self.chunksize = chunksize
+        self.errors = {}       # path -> error message
+        self.unparseable = {}  # path -> cells that could not be parsed (now 0)
+        self._failed = {}      # path -> content hash that failed; retried once it changes
+        self._local = threading.local()  # one connection per thread
+        self._lock = threading.Lock()        # one sync at a time
+        self._table_lock = threading.Lock()  # readers are not blocked by a running sync
+        self._table = None
+        self.progress = RefreshProgress()
+        self.last_error = None  # message of the last failed sync, until one succeeds
+        self._future_lock = threading.Lock()
+        self._future = None
+        self._executor = None
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._open_schema()
+        self._load_state()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            self._local.conn = conn
+        return conn
+
+    def _open_schema(self) -> None:
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        fmt = f"{SQLITE_FORMAT_VERSION}-{CACHE_FORMAT_VERSION}"
+        with conn:
+            for statement in _schema():
+                conn.execute(statement)
+            stored = conn.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+            if stored is None or stored[0] != fmt:
+                # Records from another layout or preprocessing version: start over
+                conn.execute("DELETE FROM records")
+                conn.execute("DELETE FROM files")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('format', ?)", (fmt,))
+
+    def _load_state(self) -> None:
+        """
+        Version, column set and counts of the committed files
+        """
+        conn = self._connect()
+        files = conn.execute("SELECT path, sha256, columns, bool_columns, unparseable FROM files ORDER BY rank").fetchall()
+        digest = hashlib.sha256(f"sqlite-{SQLITE_FORMAT_VERSION}-{CACHE_FORMAT_VERSION}".encode())
+        present, bools = set(), set()
+        self.unparseable = {}
+        for path, sha256, columns, bool_columns, unparseable in files:
+            digest.update(f"{path}\0{sha256}\0".encode())
+            present.update(json.loads(columns or "[]"))
+            bools.update(json.loads(bool_columns or "[]"))
+            if unparseable:
+                self.unparseable[path] = unparseable
+        self.version = digest.hexdigest()[:16] if files else "empty"
+        self.columns = [col for col in RECORD_COLUMNS if col in present]
+        self.bool_columns = bools
+        self.records = conn.execute("SELECT COALESCE(SUM(rows), 0) FROM files").fetchone()[0]
+        # A database kept from an earlier run is served while the first sync runs
+        self.ready = bool(files) or getattr(self, "ready", False)
+        self._table = None
+
+    def cached_summary(self) -> dict:
+        """
+        Counts for the loading page; an empty database has none ({}),
+        and one kept from an earlier run is served without a loading page
+        """
+        return {}
+
+    def start_sync(self):
+        """
+        Run sync() on the backend's background thread and return its
+        Future; callers arriving while a sync is in flight share it
+        """
+        with self._future_lock:
+            if self._future is None or self._future.done():
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="horm-sqlite-sync")
+                self._future = self._executor.submit(self.sync)
+            return self._future
+
+    def sync(self) -> DataChanges:
+        """
+        Ingest new or changed exports and drop removed ones; files whose
+        content matches the database are not re-read
+        """
+        with self._lock:
+            try:
+                changes = self._sync()
+            except BaseException as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self.progress = RefreshProgress()
+            self.ready = True
+            self.last_error = None
+            return changes
+
+    def _sync(self) -> DataChanges:
+        self.progress = RefreshProgress("scanning")
+        conn = self._connect()
+        known = self.watcher.known
+        self.watcher.scan()
+        stored = dict(conn.execute("SELECT path, sha256 FROM files"))
+        changes = DataChanges()
+        for path, fingerprint in self.watcher.known.items():
+            if fingerprint["sha256"] not in (stored.get(path), self._failed.get(path)):
+                (changes.changed if path in stored else changes.added).append(path)
+        changes.removed = [path for path in stored if path not in self.watcher.known]
+        if not changes:
+            return changes
+
+        pending = changes.added + changes.changed
+        self.progress = RefreshProgress("parsing", 0, len(pending))
+        errors = {}
+        conn.execute("BEGIN")
+        try:
+            for path in changes.removed:
+                self._delete(conn, path)
+            # First load into an empty database: insert without indexes and
+            # build them once afterwards (about 2x faster than maintaining them)
+            bulk = not stored
+            if bulk:
+                for name in INDEXES:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+            for done, path in enumerate(pending, 1):
+                conn.execute("SAVEPOINT ingest_file")
+                try:
+                    self._ingest(conn, path, self.watcher.known[path]["sha256"])
+                except Exception as e:
+                    conn.execute("ROLLBACK TO ingest_file")
+                    errors[path] = str(e)
+                conn.execute("RELEASE ingest_file")
+                self.progress = RefreshProgress("parsing", done, len(pending))
+            self.progress = RefreshProgress("merging", len(pending), len(pending))
+            if bulk:
+                for statement in INDEXES.values():
+                    conn.execute(statement)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            # Rescan the same changes next time
+            self.watcher.known = known
+            raise
+
+        for path in changes.removed + pending:
+            self.errors.pop(path, None)
+            self._failed.pop(path, None)
+        for path, error in errors.items():
+            self.errors[path] = error
+            self._failed[path] = self.watcher.known[path]["sha256"]
+        self._load_state()
+        return changes
+
+    def _delete(self, conn: sqlite3.Connection, path: str) -> None:
+        conn.execute("DELETE FROM records WHERE file_id IN (SELECT file_id FROM files WHERE path = ?)", (path,))
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _ingest(self, conn: sqlite3.Connection, path: str, sha256: str) -> None:
+        """
+        Replace a file's records, preprocessing and inserting one chunk at
+        a time (peak memory is one chunk)
+        """
+        self._delete(conn, path)
+        file_id = conn.execute("INSERT INTO files (path, sha256) VALUES (?, ?)", (path, sha256)).lastrowid
+        rows = unparseable = 0
+        present, bools = set(), set()
+        for chunk in iter_preprocessed_chunks(path, self.chunksize):
+            unparseable += sum(chunk.attrs.get('unparseable', {}).values())
+            columns = [col for col in RECORD_COLUMNS if col in chunk.columns]
+            present.update(columns)
+            bools.update(col for col in columns if chunk[col].dtype == bool)
+            # tolist() yields Python scalars; NaN is stored as NULL
+            values = [chunk[col].tolist() for col in columns]
+            conn.executemany(
+                f"INSERT INTO records (file_id, row_no, {', '.join(map(_quote, columns))}) "
+                f"VALUES (?, ?{', ?' * len(columns)})",
+                zip(repeat(file_id), range(rows, rows + len(chunk)), *values),
+            )
+            rows += len(chunk)
+        conn.execute(
+            "UPDATE files SET rows = ?, unparseable = ?, columns = ?, bool_columns = ? WHERE file_id = ?",
+            (rows, unparseable, json.dumps(sorted(present)), json.dumps(sorted(bools)), file_id),
+        )
+        # Records are ordered by file path, like the in-memory concatenation
+        conn.execute("UPDATE files SET rank = (SELECT COUNT(*) FROM files AS f WHERE f.path < files.path)")
+
+    def _first_columns(self) -> list:
+        return [col for col in self.columns
+                if col != 'Employee ID' and (col in PROFILE_COLUMNS or KPI_MAPPINGS.get(col) == 'first')]
+
+    def _aggregates(self) -> list:
+        return [f"{'AVG' if agg == 'mean' else 'TOTAL'}({_quote(col)})"
+                for col, agg in KPI_MAPPINGS.items() if agg != 'first' and col in self.columns]
+
+    def _employee_sql(self, where: str = "") -> tuple:
+        """
+        Per-employee aggregates; bare columns next to MIN() come from the
+        employee's first record (SQLite's min/max bare-column rule)
+        """
+        first = self._first_columns()
+        numeric = [col for col, agg in KPI_MAPPINGS.items() if agg != 'first' and col in self.columns]
+        select = ", ".join(
+            [f"MIN(files.rank * {ROW_SPAN} + records.row_no)", '"Employee ID"']
+            + [_quote(col) for col in first] + self._aggregates()
+        )
+        sql = (f"SELECT {select} FROM records JOIN files USING (file_id) {where} "
+               f"GROUP BY \"Employee ID\" ORDER BY \"Employee ID\"")
+        return sql, ['Employee ID'] + first + numeric
+
+    def _convert_first(self, column: str, value):
+        if value is None or value != value:
+            return np.nan
+        return bool(value) if column in self.bool_columns else value
+
+    def _employee_row(self, employee_id) -> dict:
+        try:
+            key = int(employee_id)
+            sql, names = self._employee_sql("WHERE \"Employee ID\" = ?")
+            row = self._connect().execute(sql, (key,)).fetchone()
+        except (OverflowError, TypeError, ValueError):
+            return {}
+        if row is None:
+            return {}
+        return dict(zip(names, row[1:]))
+
+    def __contains__(self, employee_id) -> bool:
+        try:
+            key = int(employee_id)
+            return self._connect().execute(
+                "SELECT 1 FROM records WHERE \"Employee ID\" = ? LIMIT 1", (key,)
+            ).fetchone() is not None
+        except (OverflowError, TypeError, ValueError):
+            return False
+
+    def get_kpis(self, employee_id: int) -> dict:
+        """
+        get_employee_kpis(df, employee_id) from an indexed query, equal
+        within float rounding (SQL sums in its own order)
+        """
+        row = self._employee_row(employee_id)
+        kpis = {}
+        for column in KPI_MAPPINGS:
+            if column in row:
+                value = row[column]
+                if KPI_MAPPINGS[column] == 'first':
+                    kpis[column] = self._convert_first(column, value)
+                else:
+                    kpis[column] = float(value) if value is not None else np.nan
+        return kpis
+
+    def get_profile(self, employee_id: int) -> dict:
+        """
+        Employee Name / Account code from the employee's first record
+        """
+        row = self._employee_row(employee_id)
+        return {column: self._convert_first(column, row[column]) for column in PROFILE_COLUMNS if column in row}
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """
+        Per-employee KPI table sorted by Employee ID (EmployeeIndex.table
+        layout), aggregated in SQL once per version. It is held in memory
+        (one row per employee, not per record) for search, leaderboards and
+        the team view, so the employee count is bounded by RAM.
+        """
+        with self._table_lock:
+            if self._table is None:
+                sql, names = self._employee_sql()
+                table = pd.DataFrame(self._connect().execute(sql).fetchall(), columns=['first_row'] + names)
+                for column in self._first_columns():
+                    if column in self.bool_columns:
+                        table[column] = table[column].map(lambda value: self._convert_first(column, value))
+                for column in names[1 + len(self._first_columns()):]:
+                    table[column] = table[column].astype('float64')
+                ordered = ['Employee ID'] + [col for col in list(KPI_MAPPINGS) + PROFILE_COLUMNS if col in names]
+                self._table = table[ordered]
+            return self._table
+
+    def _cohorts(self, key: str = None) -> dict:
+        """
+        CohortStats (records, employees, billed records, sums, counts,
+        means) per value of key, or overall under None, in one grouped query
+        """
+        columns = [col for col in STAT_COLUMNS if col in self.columns]
+        billed = "TOTAL(\"Billed\" IN (1, 'Billed'))" if 'Billed' in self.columns else "0"
+        select = [_quote(key) if key else "NULL", "COUNT(*)", "COUNT(DISTINCT \"Employee ID\")", billed]
+        for col in columns:
+            select += [f"TOTAL({_quote(col)})", f"COUNT({_quote(col)})"]
+        sql = f"SELECT {', '.join(select)} FROM records"
+        if key:
+            sql += f" GROUP BY {_quote(key)}"
+
+        cohorts = {}
+        for row in self._connect().execute(sql):
+            label, records, employees, billed_records = row[:4]
+            if records == 0:
+                continue
+            stats = CohortStats(records=int(records), employees=int(employees), billed=int(billed_records))
+            for j, col in enumerate(columns):
+                total, count = float(row[4 + 2 * j]), int(row[5 + 2 * j])
+                stats.mean[col] = total / count if count else 0.0
+                stats.sum[col] = total
+                stats.count[col] = count
+            cohorts[self._convert_first(key, label) if key else None] = stats
+        return cohorts
+
+    def stats_snapshot(self) -> StatsSnapshot:
+        """
+        build_stats_snapshot() counterpart: overall, per-account and
+        per-billing aggregates pushed down as grouped queries. Percentiles
+        and histograms are left empty (they would need every value).
+        """
+        columns = [col for col in STAT_COLUMNS if col in self.columns]
+        overall = self._cohorts().get(None, CohortStats(records=0, employees=0, billed=0))
+        return StatsSnapshot(
+            columns=columns,
+            bin_edges={},
+            overall=overall,
+            by_account=self._cohorts('Account code') if 'Account code' in self.columns else {},
+            by_billed=self._cohorts('Billed') if 'Billed' in self.columns else {},
+        )
+
+    def disk_bytes(self) -> int:
+        """
+        Size of the database files (WAL included)
+        """
+        return sum(os.path.getsize(path) for path in (self.db_path, self.db_path + "-wal")
+                   if os.path.exists(path))
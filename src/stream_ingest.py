@@ -0,0 +1,224 @@
+# src/stream_ingest.py
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from data_processing import (KPI_MAPPINGS, PROFILE_COLUMNS, EmployeeIndex, fold_kpi_sums, full_precision,
+                             kpi_values, preprocess_data)
+
+DEFAULT_CHUNKSIZE = 50_000
+
+def iter_excel_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE, sheet=None):
+    """
+    Yield DataFrames of up to chunksize rows from a workbook sheet
+    (the first sheet by default), streaming rows with openpyxl read-only mode
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(name) if name is not None else f"Unnamed: {i}"
+            for i, name in enumerate(header)
+        ]
+
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row)
+            if len(buffer) >= chunksize:
+                yield pd.DataFrame(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+def iter_csv_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Yield DataFrames of up to chunksize rows from a CSV export
+    """
+    with pd.read_csv(path, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+def iter_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Row chunks from an .xlsx or .csv file
+    """
+    if os.path.splitext(path)[1].lower() == ".csv":
+        return iter_csv_chunks(path, chunksize)
+    return iter_excel_chunks(path, chunksize)
+
+def iter_preprocessed_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Preprocessed row chunks of one file. The Excel day-fraction scaling of
+    each clock column is decided on the first chunk holding numbers in it
+    and kept for the rest of the file, so chunks are not scaled differently.
+    """
+    day_fractions = {}
+    for chunk in iter_chunks(path, chunksize):
+        chunk = preprocess_data(chunk, day_fractions=day_fractions)
+        day_fractions = chunk.attrs['day_fractions']
+        yield chunk
+
+class KpiAccumulator:
+    """
+    Per-employee aggregates folded one record at a time: sums and counts
+    for the 'mean' columns, sums for the 'sum' columns and the first
+    record's 'first' and profile columns. Records go through
+    fold_kpi_sums like aggregate_employee_kpis, so adding the chunks of a
+    frame in order gives exactly its table. Memory grows with employees,
+    not with rows.
+    """
+
+    def __init__(self):
+        self.columns = [col for col, agg in KPI_MAPPINGS.items() if agg != 'first']
+        self.present = set()   # numeric columns seen in any chunk
+        self.rows = {}         # Employee ID -> row of the arrays below
+        self.sums = np.zeros((0, len(self.columns)))
+        self.counts = np.zeros((0, len(self.columns)), dtype=np.int64)
+        self.firsts = []       # first records of the employees new in each chunk
+        self.records = 0
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold a preprocessed chunk into the running aggregates; chunks count
+        as coming after the ones already added
+        """
+        if chunk.empty or 'Employee ID' not in chunk.columns:
+            return
+
+        first = [col for col, agg in KPI_MAPPINGS.items() if agg == 'first' and col in chunk.columns]
+        first += [col for col in PROFILE_COLUMNS if col in chunk.columns]
+        self.present.update(col for col in self.columns if col in chunk.columns)
+
+        local, ids = pd.factorize(chunk['Employee ID'].to_numpy(), sort=False)
+        known = len(self.rows)
+        # New IDs get the next rows, in first-seen order
+        rows = np.fromiter((self.rows.setdefault(emp_id, len(self.rows)) for emp_id in ids.tolist()),
+                           dtype=np.intp, count=len(ids))
+        self._reserve(len(self.rows))
+        values = np.full((len(self.columns), len(chunk)), np.nan)
+        for i, col in enumerate(self.columns):
+            if col in chunk.columns:
+                values[i] = full_precision(chunk[col]).to_numpy(dtype='float64', na_value=np.nan)
+        fold_kpi_sums(rows[local], values, self.sums, self.counts)
+
+        # First records in first-seen order, i.e. in the order of ids; only
+        # employees not seen before keep theirs. Concatenated in result().
+        firsts = chunk.loc[~chunk['Employee ID'].duplicated(), ['Employee ID'] + first]
+        new_ids = rows >= known
+        if new_ids.any():
+            self.firsts.append(firsts[new_ids])
+        self.records += len(chunk)
+
+    def copy(self) -> "KpiAccumulator":
+        """
+        Accumulator with the same aggregates, to fold into without
+        touching this one
+        """
+        other = KpiAccumulator()
+        other.present = set(self.present)
+        other.rows = dict(self.rows)
+        other.sums, other.counts = self.sums.copy(), self.counts.copy()
+        other.firsts = list(self.firsts)
+        other.records = self.records
+        return other
+
+    def _reserve(self, employees: int) -> None:
+        # Grow the arrays geometrically, so adding employees is amortized O(1)
+        if employees <= len(self.sums):
+            return
+        capacity = max(employees, 2 * len(self.sums), 1024)
+        for name in ('sums', 'counts'):
+            current = getattr(self, name)
+            grown = np.zeros((capacity, current.shape[1]), dtype=current.dtype)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
+
+    @property
+    def employees(self) -> int:
+        return len(self.rows)
+
+    def result(self) -> pd.DataFrame:
+        """
+        Per-employee KPI table, same layout and values as
+        aggregate_employee_kpis(df, include_profile=True)
+        """
+        if not self.rows:
+            return pd.DataFrame(columns=['Employee ID'])
+
+        n = len(self.rows)
+        columns = [col for col in self.columns if col in self.present]
+        positions = [self.columns.index(col) for col in columns]
+        values = kpi_values(self.sums[:n, positions], self.counts[:n, positions], columns)
+        ids = pd.Index(np.fromiter(self.rows, dtype=np.int64, count=n), name='Employee ID')
+        firsts = pd.concat(self.firsts, ignore_index=True).set_index('Employee ID')
+        table = pd.DataFrame(values, columns=columns, index=ids).join(firsts)
+        ordered = [col for col in list(KPI_MAPPINGS) + PROFILE_COLUMNS if col in table.columns]
+        return table[ordered].reset_index()
+
+    def overall_means(self) -> dict:
+        """
+        Record-level population means over all rows added
+        """
+        n = len(self.rows)
+        totals, counts = self.sums[:n].sum(axis=0), self.counts[:n].sum(axis=0)
+        return {col: float(totals[i] / counts[i]) if counts[i] else 0.0
+                for i, col in enumerate(self.columns) if col in self.present}
+
+    def to_index(self) -> EmployeeIndex:
+        return EmployeeIndex(self.result())
+
+@dataclass
+class IngestReport:
+    """
+    Throughput of one streaming ingestion run
+    """
+    path: str
+    rows: int
+    chunks: int
+    employees: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{os.path.basename(self.path)}: {self.rows:,} rows in {self.chunks} chunks, "
+                f"{self.employees:,} employees, {self.seconds:.2f}s "
+                f"({self.rows_per_sec:,.0f} rows/sec)")
+
+def stream_ingest(path: str, chunksize: int = DEFAULT_CHUNKSIZE, progress=None):
+    """
+    Read an attendance export chunk by chunk, preprocess each chunk and
+    fold it into a KpiAccumulator, so peak memory is one chunk plus the
+    per-employee aggregates. progress(report) is called after each chunk.
+    Returns (accumulator, report).
+    """
+    accumulator = KpiAccumulator()
+    report = IngestReport(path=path, rows=0, chunks=0, employees=0, seconds=0.0)
+    start = time.perf_counter()
+
+    for chunk in iter_preprocessed_chunks(path, chunksize):
+        report.rows += len(chunk)
+        accumulator.add(chunk)
+        report.chunks += 1
+        report.employees = accumulator.employees
+        report.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(report)
+
+    report.seconds = time.perf_counter() - start
+    return accumulator, report
@@ -0,0 +1,297 @@
+# src/swipe_ingest.py
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Zone of a swipe -> where the time until the employee's next swipe is spent
+OFFICE, BREAK, CAFETERIA, OOO = 0, 1, 2, 3
+ZONE_CATEGORIES = {
+    'main entrance': OFFICE, 'entrance': OFFICE, 'reception': OFFICE, 'lobby': OFFICE,
+    'bay': OFFICE, 'office': OFFICE, 'desk': OFFICE, 'meeting room': OFFICE,
+    'break room': BREAK, 'break': BREAK, 'lounge': BREAK, 'pantry': BREAK,
+    'cafeteria': CAFETERIA, 'canteen': CAFETERIA, 'food court': CAFETERIA,
+    'exit': OOO, 'out': OOO, 'gate out': OOO, 'main exit': OOO,
+}
+SWIPE_COLUMNS = ('Employee ID', 'Timestamp', 'Zone')
+# A day on premises shorter than this counts as a half-day leave
+HALF_DAY_HOURS = 4.5
+DEFAULT_CHUNKSIZE = 1_000_000
+# Events per spill bucket; bounds the memory of the sessionization pass
+DEFAULT_BUCKET_EVENTS = 5_000_000
+# Throughput the ingestion is expected to sustain on one core
+TARGET_EVENTS_PER_SEC = 1_000_000
+
+def categorize_zones(zones: pd.Series) -> np.ndarray:
+    """
+    OFFICE/BREAK/CAFETERIA/OOO code per swipe; unknown zones count as office.
+    Only the distinct zone names are looked up.
+    """
+    codes, uniques = pd.factorize(zones)
+    lookup = np.array(
+        [ZONE_CATEGORIES.get(str(zone).strip().lower(), OFFICE) for zone in uniques] + [OFFICE],
+        dtype=np.int8
+    )
+    return lookup[codes]  # code -1 (missing zone) picks the trailing OFFICE
+
+def _clean_events(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Typed (Employee ID int64, Timestamp datetime64[ns], Category int8)
+    events; rows without a usable ID or timestamp are dropped
+    """
+    ids = pd.to_numeric(chunk['Employee ID'], errors='coerce')
+    stamps = pd.to_datetime(chunk['Timestamp'], errors='coerce')
+    valid = (ids.notna() & stamps.notna()).to_numpy()
+    return pd.DataFrame({
+        'Employee ID': ids.to_numpy()[valid].astype(np.int64),
+        'Timestamp': stamps.to_numpy(dtype='datetime64[ns]')[valid],
+        'Category': categorize_zones(chunk['Zone'])[valid],
+    })
+
+def sessionize(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per employee per calendar day from typed events: in/out times
+    as decimal hours and hours spent per category. The time between two
+    swipes is attributed to the zone of the earlier one; Office Hrs is the
+    span from first to last swipe minus OOO time.
+    """
+    emp = events['Employee ID'].to_numpy()
+    ts = events['Timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    category = events['Category'].to_numpy()
+    if not len(emp):
+        return pd.DataFrame(columns=['Employee ID', 'Date', 'In', 'Out', 'Break', 'Cafeteria', 'OOO', 'Office'])
+
+    # lexsort is stable: simultaneous swipes keep their log order
+    order = np.lexsort((ts, emp))
+    emp, ts, category = emp[order], ts[order], category[order]
+    day_ns = np.int64(86_400 * 10**9)
+    day = ts // day_ns
+
+    starts = np.r_[True, (emp[1:] != emp[:-1]) | (day[1:] != day[:-1])]
+    session = np.cumsum(starts) - 1
+    first = np.flatnonzero(starts)
+    last = np.r_[first[1:], len(ts)] - 1
+
+    # Seconds until the next swipe of the same session (0 for the last one)
+    gap = np.zeros(len(ts))
+    same = ~starts[1:]
+    gap[:-1][same] = (ts[1:][same] - ts[:-1][same]) / 1e9
+    n_sessions = len(first)
+    per_category = np.bincount(session * 4 + category, weights=gap, minlength=n_sessions * 4)
+    hours = per_category.reshape(n_sessions, 4) / 3600.0
+
+    start_of_day = day[first] * day_ns
+    in_time = (ts[first] - start_of_day) / 3.6e12
+    out_time = (ts[last] - start_of_day) / 3.6e12
+    return pd.DataFrame({
+        'Employee ID': emp[first],
+        'Date': day[first].astype('datetime64[D]'),
+        'In': in_time,
+        'Out': out_time,
+        'Break': hours[:, BREAK],
+        'Cafeteria': hours[:, CAFETERIA],
+        'OOO': hours[:, OOO],
+        'Office': out_time - in_time - hours[:, OOO],
+    })
+
+def summarize_days(days: pd.DataFrame, first_day, last_day, period: str = 'M') -> pd.DataFrame:
+    """
+    Per-employee, per-period records in the schema preprocess_data expects:
+    Avg. columns are means over the days present, Full Day Leave counts
+    weekdays of the period (within [first_day, last_day]) without swipes and
+    Half Day Leave counts days shorter than HALF_DAY_HOURS.
+    period is a pandas period alias ('M', 'W', ...) or None for the whole range.
+    """
+    first_day = np.datetime64(first_day, 'D')
+    last_day = np.datetime64(last_day, 'D')
+    dates = days['Date'].to_numpy(dtype='datetime64[D]')
+    if period is None:
+        labels = np.zeros(len(days), dtype=np.int64)
+        bounds = {0: (first_day, last_day)}
+    else:
+        labels = pd.PeriodIndex(dates, freq=period).asi8
+        bounds = {
+            p.ordinal: (max(first_day, np.datetime64(p.start_time.date(), 'D')),
+                        min(last_day, np.datetime64(p.end_time.date(), 'D')))
+            for p in pd.PeriodIndex.from_ordinals(pd.unique(labels), freq=period)
+        }
+
+    weekday = np.is_busday(dates)
+    frame = pd.DataFrame({
+        'Employee ID': days['Employee ID'].to_numpy(),
+        'Period': labels,
+        'Avg. In Time': days['In'].to_numpy(),
+        'Avg. Out Time': days['Out'].to_numpy(),
+        'Avg. Break Hrs': days['Break'].to_numpy(),
+        'Avg. Cafeteria Hrs': days['Cafeteria'].to_numpy(),
+        'Avg. Office Hrs': days['Office'].to_numpy(),
+        'Avg. OOO Hrs': days['OOO'].to_numpy(),
+        'Weekdays Present': weekday,
+        'Half Day Leave': days['Office'].to_numpy() < HALF_DAY_HOURS,
+    })
+    grouped = frame.groupby(['Employee ID', 'Period'], sort=True)
+    hour_columns = ['Avg. In Time', 'Avg. Out Time', 'Avg. Break Hrs', 'Avg. Cafeteria Hrs',
+                    'Avg. Office Hrs', 'Avg. OOO Hrs']
+    result = grouped[hour_columns].mean().round(4)
+    counts = grouped[['Weekdays Present', 'Half Day Leave']].sum()
+
+    period_labels = result.index.get_level_values('Period').to_numpy()
+    inverse, unique_labels = pd.factorize(period_labels)
+    workdays = np.array([
+        np.busday_count(bounds[label][0], bounds[label][1] + np.timedelta64(1, 'D'))
+        for label in unique_labels
+    ], dtype=np.int64)[inverse]
+    result['Full Day Leave'] = np.maximum(workdays - counts['Weekdays Present'].to_numpy(), 0)
+    result['Half Day Leave'] = counts['Half Day Leave'].to_numpy().astype(np.int64)
+    if period is not None:
+        result['Period'] = pd.PeriodIndex.from_ordinals(period_labels, freq=period).astype(str)
+    return result.reset_index(level='Period', drop=True).reset_index()
+
+@dataclass
+class SwipeIngestReport:
+    """
+    Throughput and memory footprint of one swipe ingestion run
+    """
+    events: int = 0
+    dropped: int = 0
+    sessions: int = 0
+    records: int = 0
+    buckets: int = 1
+    max_bucket_events: int = 0
+    seconds: float = 0.0
+
+    @property
+    def events_per_sec(self) -> float:
+        return self.events / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def meets_target(self) -> bool:
+        return self.events_per_sec >= TARGET_EVENTS_PER_SEC
+
+    def __str__(self) -> str:
+        return (f"{self.events:,} swipes ({self.dropped:,} dropped) -> {self.sessions:,} employee-days -> "
+                f"{self.records:,} records in {self.seconds:.2f}s ({self.events_per_sec:,.0f} events/sec, "
+                f"{self.buckets} bucket(s), largest {self.max_bucket_events:,} events)")
+
+def iter_swipe_chunks(source, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Raw swipe chunks from a DataFrame, a .csv or a .parquet file
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+    elif os.path.splitext(source)[1].lower() == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize, columns=list(SWIPE_COLUMNS)):
+            yield batch.to_pandas()
+    else:
+        with pd.read_csv(source, chunksize=chunksize, usecols=list(SWIPE_COLUMNS)) as reader:
+            for chunk in reader:
+                yield chunk
+
+def count_swipe_events(source, block_size: int = 1 << 20) -> int:
+    """
+    Number of raw swipes in a source without loading it: the length of a
+    DataFrame, the row count in Parquet metadata or the data lines of a
+    CSV (newlines counted in binary blocks, header excluded)
+    """
+    if isinstance(source, pd.DataFrame):
+        return len(source)
+    if os.path.splitext(source)[1].lower() == '.parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(source).metadata.num_rows
+    lines = 0
+    last = b"\n"
+    with open(source, "rb") as fh:
+        while block := fh.read(block_size):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    lines += last != b"\n"  # final line without a trailing newline
+    return max(lines - 1, 0)
+
+def ingest_swipes(source, period: str = 'M', roster: pd.DataFrame = None,
+                  chunksize: int = DEFAULT_CHUNKSIZE, bucket_events: int = DEFAULT_BUCKET_EVENTS,
+                  expected_events: int = None, workdir: str = None, progress=None):
+    """
+    Raw badge swipes -> per-employee attendance records ready for
+    preprocess_data / get_employee_kpis.
+
+    Events are read in chunks and, when more than bucket_events are
+    expected (expected_events, else count_swipe_events(source)), spilled to Parquet buckets by Employee ID so each bucket is sessionized
+    on its own and peak memory stays around one bucket. roster optionally
+    adds profile columns ('Employee Name', 'Account code', 'Billed') by
+    Employee ID. Returns (records, SwipeIngestReport).
+    """
+    report = SwipeIngestReport()
+    start = time.perf_counter()
+    if expected_events is None:
+        expected_events = count_swipe_events(source)
+    n_buckets = max(1, -(-(expected_events or 0) // bucket_events))
+    report.buckets = n_buckets
+
+    first_day = last_day = None
+    pieces = []
+    spill_dir = None
+    writers = {}
+    try:
+        if n_buckets > 1:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            spill_dir = tempfile.mkdtemp(prefix='swipes-', dir=workdir)
+
+        for chunk in iter_swipe_chunks(source, chunksize):
+            events = _clean_events(chunk)
+            report.events += len(chunk)
+            report.dropped += len(chunk) - len(events)
+            if not len(events):
+                continue
+            days = events['Timestamp'].to_numpy().astype('datetime64[D]')
+            first_day = days.min() if first_day is None else min(first_day, days.min())
+            last_day = days.max() if last_day is None else max(last_day, days.max())
+
+            if spill_dir is None:
+                pieces.append(events)
+            else:
+                bucket = events['Employee ID'].to_numpy() % n_buckets
+                for b in pd.unique(bucket):
+                    table = pa.Table.from_pandas(events[bucket == b], preserve_index=False)
+                    if b not in writers:
+                        writers[b] = pq.ParquetWriter(os.path.join(spill_dir, f'{b}.parquet'), table.schema)
+                    writers[b].write_table(table)
+            if progress is not None:
+                report.seconds = time.perf_counter() - start
+                progress(report)
+
+        for writer in writers.values():
+            writer.close()
+        if spill_dir is None:
+            batches = [pd.concat(pieces, ignore_index=True)] if pieces else []
+        else:
+            batches = (pq.read_table(os.path.join(spill_dir, f'{b}.parquet')).to_pandas()
+                       for b in sorted(writers))
+
+        records = []
+        for events in batches:
+            report.max_bucket_events = max(report.max_bucket_events, len(events))
+            days = sessionize(events)
+            del events
+            report.sessions += len(days)
+            records.append(summarize_days(days, first_day, last_day, period))
+    finally:
+        for writer in writers.values():
+            writer.close()
+        if spill_dir is not None:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    result = pd.concat(records, ignore_index=True) if records else pd.DataFrame(columns=['Employee ID'])
+    if roster is not None and len(result):
+        profile = [col for col in ('Employee Name', 'Account code', 'Billed') if col in roster.columns]
+        result = result.merge(roster.drop_duplicates('Employee ID')[['Employee ID'] + profile],
+                              on='Employee ID', how='left')
+    report.records = len(result)
+    report.seconds = time.perf_counter() - start
+    return result, report
@@ -0,0 +1,165 @@
+# src/synthetic_data.py
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_processing import HOUR_COLUMNS, LEAVE_COLUMNS
+
+# Per-employee typical value and day-to-day spread for each hour column
+HOUR_PROFILES = {
+    'Avg. In Time': (9.0, 0.5, 0.4),        # (mean, spread across employees, daily noise)
+    'Avg. Out Time': (18.0, 0.5, 0.5),
+    'Avg. Break Hrs': (0.5, 0.2, 0.15),
+    'Avg. Cafeteria Hrs': (0.3, 0.1, 0.1),
+    'Avg. Office Hrs': (8.5, 0.3, 0.4),
+    'Avg. OOO Hrs': (0.2, 0.1, 0.1),
+}
+# Daily leave probability (full day, half day)
+LEAVE_RATES = {'Full Day Leave': 0.03, 'Half Day Leave': 0.02}
+BILLED_RATE = 0.8
+ACCOUNT_COUNT = 40
+# Values preprocess_data has to coerce away
+DIRTY_NUMBERS = ('N/A', '-', '', 'abc', '#REF!', None, np.nan)
+DIRTY_IDS = ('EMP-X', 'n/a', '', None, np.nan)
+DEFAULT_CHUNK_EMPLOYEES = 50_000
+# Employees drawn from one seeded generator; output does not depend on chunk size
+SEED_BLOCK_EMPLOYEES = 1000
+
+def _dirty(values: np.ndarray, rng: np.random.Generator, rate: float, choices) -> np.ndarray:
+    """
+    Replace a rate share of values with junk, turning the column to object
+    """
+    hits = np.flatnonzero(rng.random(len(values)) < rate)
+    if not len(hits):
+        return values
+    dirty = values.astype(object)
+    junk = np.empty(len(choices), dtype=object)
+    junk[:] = list(choices)
+    dirty[hits] = junk[rng.integers(0, len(choices), len(hits))]
+    return dirty
+
+def _generate_block(first_id: int, n_employees: int, records: int, rng: np.random.Generator,
+                    dirty_rate: float) -> pd.DataFrame:
+    ids = np.arange(first_id, first_id + n_employees)
+    rows = n_employees * records
+    accounts = np.array([f'ACC{100 + k}' for k in range(ACCOUNT_COUNT)])
+
+    data = {
+        'Employee ID': np.repeat(ids, records),
+        'Employee Name': np.repeat(np.char.add('Employee ', ids.astype(str)), records),
+        'Account code': np.repeat(accounts[rng.integers(0, ACCOUNT_COUNT, n_employees)], records),
+    }
+    for col in HOUR_COLUMNS:
+        mean, spread, noise = HOUR_PROFILES[col]
+        typical = np.repeat(rng.normal(mean, spread, n_employees), records)
+        data[col] = np.round(np.maximum(typical + rng.normal(0, noise, rows), 0), 2)
+    for col in LEAVE_COLUMNS:
+        data[col] = (rng.random(rows) < LEAVE_RATES[col]).astype(np.int64)
+    data['Billed'] = np.repeat(rng.random(n_employees) < BILLED_RATE, records)
+
+    if dirty_rate > 0:
+        for col in HOUR_COLUMNS + LEAVE_COLUMNS:
+            data[col] = _dirty(data[col], rng, dirty_rate, DIRTY_NUMBERS)
+        data['Employee ID'] = _dirty(data['Employee ID'], rng, dirty_rate / 10, DIRTY_IDS)
+    return pd.DataFrame(data)
+
+def iter_synthetic_chunks(n_employees: int, records_per_employee: int = 1, seed: int = 42,
+                          dirty_rate: float = 0.01, chunk_employees: int = DEFAULT_CHUNK_EMPLOYEES):
+    """
+    Yield synthetic attendance records in blocks of chunk_employees
+    employees (all of an employee's records in one block), so tens of
+    millions of rows can be written without holding them in memory.
+    Records are drawn per SEED_BLOCK_EMPLOYEES employees from
+    [seed, block] generators, so the concatenated output depends only on
+    n_employees, records_per_employee, seed and dirty_rate.
+    """
+    pending, pending_employees = [], 0
+    for block, first in enumerate(range(0, n_employees, SEED_BLOCK_EMPLOYEES)):
+        rng = np.random.default_rng([seed, block])
+        size = min(SEED_BLOCK_EMPLOYEES, n_employees - first)
+        frame = _generate_block(first + 1, size, records_per_employee, rng, dirty_rate)
+        taken = 0
+        while taken < size:
+            take = min(size - taken, chunk_employees - pending_employees)
+            pending.append(frame.iloc[taken * records_per_employee:(taken + take) * records_per_employee])
+            pending_employees += take
+            taken += take
+            if pending_employees == chunk_employees:
+                yield pd.concat(pending, ignore_index=True)
+                pending, pending_employees = [], 0
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+def generate_attendance(n_employees: int, records_per_employee: int = 1, seed: int = 42,
+                        dirty_rate: float = 0.01, chunk_employees: int = DEFAULT_CHUNK_EMPLOYEES) -> pd.DataFrame:
+    """
+    Synthetic raw attendance export in the dashboard's schema: N employees
+    x M records, with a dirty_rate share of junk strings/NaNs in numeric
+    columns and non-numeric Employee IDs for preprocess_data to coerce
+    """
+    return pd.concat(
+        iter_synthetic_chunks(n_employees, records_per_employee, seed, dirty_rate, chunk_employees),
+        ignore_index=True
+    )
+
+def write_synthetic_csv(path: str, n_employees: int, records_per_employee: int = 1, seed: int = 42,
+                        dirty_rate: float = 0.01, chunk_employees: int = DEFAULT_CHUNK_EMPLOYEES) -> int:
+    """
+    Stream a synthetic export to CSV block by block; returns rows written
+    """
+    rows = 0
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for chunk in iter_synthetic_chunks(n_employees, records_per_employee, seed, dirty_rate, chunk_employees):
+        chunk.to_csv(path, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+        rows += len(chunk)
+    return rows
+
+# Door/zone swipes per working day: (zone, typical minutes since the previous swipe)
+SWIPE_DAY = (
+    ('Main Entrance', None),   # arrival, from the In Time profile
+    ('Bay', 5),
+    ('Break Room', 120),
+    ('Bay', 15),
+    ('Cafeteria', 90),
+    ('Bay', 35),
+    ('Exit', 120),             # out of office (OOO) ...
+    ('Main Entrance', 15),     # ... and back
+    ('Exit', None),            # departure, from the Out Time profile
+)
+SWIPE_ABSENCE_RATE = 0.03
+
+def generate_swipe_events(n_employees: int, days: int = 20, seed: int = 42,
+                          start: str = "2024-01-01") -> pd.DataFrame:
+    """
+    Synthetic raw badge swipes ('Employee ID', 'Timestamp', 'Zone') for
+    n_employees over the first `days` weekdays from start, ordered by time
+    like a door-controller log. Some days are skipped as absences.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=days).to_numpy(dtype='datetime64[ns]')
+    emp = np.repeat(np.arange(1, n_employees + 1), days)
+    day = np.tile(dates, n_employees)
+    present = rng.random(len(emp)) >= SWIPE_ABSENCE_RATE
+    emp, day = emp[present], day[present]
+    n = len(emp)
+
+    in_profile = np.repeat(rng.normal(9.0, 0.5, n_employees), days)[present]
+    out_profile = np.repeat(rng.normal(18.0, 0.5, n_employees), days)[present]
+    arrival = np.clip(in_profile + rng.normal(0, 0.25, n), 6.0, 12.0) * 60
+    departure = np.clip(out_profile + rng.normal(0, 0.25, n), 14.0, 23.0) * 60
+
+    # Minutes after midnight of every swipe, strictly increasing within a day
+    steps = np.array([minutes for _, minutes in SWIPE_DAY[1:-1]], dtype=float)
+    gaps = rng.gamma(4.0, steps / 4.0, size=(n, len(steps)))
+    gaps[:, 6] *= rng.random(n) < 0.3  # most days have no OOO trip
+    minutes = arrival[:, None] + np.concatenate([np.zeros((n, 1)), np.cumsum(gaps, axis=1)], axis=1)
+    minutes = np.concatenate([minutes, np.maximum(departure, minutes[:, -1] + 1)[:, None]], axis=1)
+
+    zones = np.array([zone for zone, _ in SWIPE_DAY], dtype=object)
+    events = pd.DataFrame({
+        'Employee ID': np.repeat(emp, len(SWIPE_DAY)),
+        'Timestamp': np.repeat(day, len(SWIPE_DAY)) + (minutes.ravel() * 60e9).astype('timedelta64[ns]'),
+        'Zone': np.tile(zones, n),
+    })
+    return events.sort_values('Timestamp', kind='stable', ignore_index=True)
@@ -0,0 +1,105 @@
+# src/team_view.py
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from kpi_stats import HISTOGRAM_BINS, STAT_COLUMNS, bin_columns, billed_mask, grouped_histograms
+from rule_based import RULE_MESSAGES, evaluate_rule_masks
+
+@dataclass
+class TeamStats:
+    """
+    Per-employee KPI aggregates of one Account code: means overall and
+    split by billing status, the share of employees each rule fires for
+    and histogram counts per column (rows: billed, unbilled)
+    """
+    account: object
+    employees: int
+    billed: int
+    mean: dict = field(default_factory=dict)
+    billed_mean: dict = field(default_factory=dict)    # {True/False: {column: mean}}
+    rule_share: dict = field(default_factory=dict)     # {rule message: share of employees}
+    histograms: dict = field(default_factory=dict)     # {column: int array (2, nbins)}
+
+    @property
+    def unbilled(self) -> int:
+        return self.employees - self.billed
+
+class TeamView:
+    """
+    Team statistics for every account from a per-employee KPI table, with
+    one grouped aggregation over (account, billed) and bincounts for rule
+    hits and histograms, so a team of any size costs the same to display:
+    a few numbers and nbins counts per column.
+    """
+
+    def __init__(self, kpis: pd.DataFrame, masks: np.ndarray = None, messages=RULE_MESSAGES,
+                 nbins: int = HISTOGRAM_BINS):
+        self.columns = [col for col in STAT_COLUMNS if col in kpis.columns]
+        self.messages = messages
+        self.nbins = nbins
+        masks = evaluate_rule_masks(kpis) if masks is None else masks
+
+        accounts = kpis['Account code'] if 'Account code' in kpis.columns else pd.Series([None] * len(kpis))
+        codes, labels = pd.factorize(accounts, sort=True, use_na_sentinel=False)
+        self.accounts = list(labels)
+        ngroups = len(self.accounts)
+        self.has_billing = 'Billed' in kpis.columns
+        billed = billed_mask(kpis['Billed']) if self.has_billing else np.zeros(len(kpis), dtype=bool)
+        # Group 2k is account k billed, 2k + 1 the same account unbilled
+        split = codes * 2 + (~billed).astype(np.int64)
+
+        values = pd.DataFrame(
+            {col: pd.to_numeric(kpis[col], errors='coerce').to_numpy(dtype='float64') for col in self.columns}
+        )
+        grouped = values.groupby(split)
+        sums = grouped.sum().reindex(range(ngroups * 2)).to_numpy().reshape(ngroups, 2, -1)
+        counts = grouped.count().reindex(range(ngroups * 2)).to_numpy().reshape(ngroups, 2, -1)
+        self._sums = np.nan_to_num(sums)
+        self._counts = np.nan_to_num(counts)
+
+        self._employees = np.bincount(codes, minlength=ngroups)
+        self._billed = np.bincount(codes, weights=billed, minlength=ngroups).astype(np.int64)
+
+        # Rule hits per account: bit b of every mask counted into account * nrules + b
+        nrules = len(messages)
+        bits = (np.asarray(masks, dtype=np.int64)[:, None] >> np.arange(nrules)) & 1
+        flat = codes[:, None] * nrules + np.arange(nrules)
+        self._rule_hits = np.bincount(flat.ravel(), weights=bits.ravel(),
+                                      minlength=ngroups * nrules).reshape(ngroups, nrules)
+
+        self.bin_edges, bins = bin_columns(values, nbins)
+        self._histograms = grouped_histograms(bins, split, ngroups * 2, nbins).reshape(
+            ngroups, 2, len(self.columns), nbins
+        )
+        self._index = {account: k for k, account in enumerate(self.accounts)}
+
+    def __contains__(self, account) -> bool:
+        return account in self._index
+
+    def team(self, account) -> TeamStats:
+        """
+        TeamStats of one account (KeyError for an unknown account)
+        """
+        k = self._index[account]
+        employees = int(self._employees[k])
+        sums, counts = self._sums[k], self._counts[k]
+
+        def means(total, count):
+            return {col: float(total[j] / count[j]) if count[j] else 0.0 for j, col in enumerate(self.columns)}
+
+        return TeamStats(
+            account=account,
+            employees=employees,
+            billed=int(self._billed[k]),
+            mean=means(sums.sum(axis=0), counts.sum(axis=0)),
+            billed_mean={True: means(sums[0], counts[0]), False: means(sums[1], counts[1])},
+            rule_share={message: float(self._rule_hits[k, b] / employees) if employees else 0.0
+                        for b, message in enumerate(self.messages)},
+            histograms={col: self._histograms[k, :, j] for j, col in enumerate(self.columns)},
+        )
+
+def build_team_view(kpis: pd.DataFrame, masks: np.ndarray = None, messages=RULE_MESSAGES,
+                    nbins: int = HISTOGRAM_BINS) -> TeamView:
+    return TeamView(kpis, masks, messages, nbins)
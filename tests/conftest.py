@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# Modules in src/ import each other by bare name, as when the app runs from src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
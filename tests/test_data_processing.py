@@ -0,0 +1,125 @@
+# tests/test_data_processing.py
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing import (HOUR_COLUMNS, aggregate_employee_kpis, build_employee_index, get_employee_kpis,
+                             parse_hours, preprocess_data)
+from rule_based import recommend_actions_batch
+from synthetic_data import generate_attendance
+
+@pytest.fixture(scope="module")
+def frame():
+    return preprocess_data(generate_attendance(1500, 4, seed=5, dirty_rate=0.02))
+
+def test_index_lookup_matches_scan(frame):
+    index = build_employee_index(frame)
+    ids = frame['Employee ID'].unique()
+    assert len(index) == len(ids)
+    for emp_id in ids:
+        expected = get_employee_kpis(frame, emp_id)
+        assert index.get_kpis(emp_id) == expected, emp_id
+
+def test_index_lookup_of_unknown_id(frame):
+    index = build_employee_index(frame)
+    assert index.get_kpis(-1) == {} == get_employee_kpis(frame, -1)
+    assert -1 not in index
+
+def _clock_strings(hours: pd.Series, rng: np.random.Generator) -> list:
+    seconds = np.round(hours.to_numpy(dtype='float64') * 3600) + rng.integers(0, 60, len(hours))
+    return [f"{int(s // 3600)}:{int(s % 3600 // 60):02d}:{int(s % 60):02d}" for s in seconds]
+
+@pytest.mark.parametrize("clock_strings", [False, True])
+def test_compact_layout_keeps_kpis_and_recommendations(clock_strings):
+    raw = generate_attendance(2000, 4, seed=9, dirty_rate=0.0 if clock_strings else 0.02)
+    if clock_strings:
+        # Non-round hour values, as parsed from real HH:MM:SS exports
+        rng = np.random.default_rng(2)
+        for col in HOUR_COLUMNS:
+            raw[col] = _clock_strings(raw[col], rng)
+
+    full = preprocess_data(raw.copy())
+    compact = preprocess_data(raw.copy(), compact=True)
+    pd.testing.assert_frame_equal(aggregate_employee_kpis(compact, include_profile=True),
+                                  aggregate_employee_kpis(full, include_profile=True),
+                                  check_dtype=False, check_exact=True, check_categorical=False)
+    pd.testing.assert_frame_equal(recommend_actions_batch(compact), recommend_actions_batch(full))
+
+    memory = compact.attrs['memory_bytes']
+    ratio = memory['before'] / memory['after']
+    if clock_strings:
+        assert all(compact[col].dtype == np.float64 for col in HOUR_COLUMNS)
+        assert 1.5 < ratio < 2.5
+    else:
+        assert all(compact[col].dtype == np.float32 for col in HOUR_COLUMNS)
+        assert ratio > 2.5
+
+TEXT_CASES = [
+    ("09:15", 9.25, 0),
+    ("9:15:30", 9 + 15 / 60 + 30 / 3600, 0),
+    ("8:30 AM", 8.5, 0),
+    ("8:30 PM", 20.5, 0),
+    ("12:00 AM", 0.0, 0),
+    ("12:30 PM", 12.5, 0),
+    ("1 days 02:00:00", 26.0, 0),
+    ("2024-01-05 09:30:00", 9.5, 0),
+    ("9.5", 9.5, 0),
+    ("24:00", 24.0, 0),
+    ("-1.5", -1.5, 0),          # negative decimal hours are kept as numbers
+    ("-01:30", np.nan, 1),      # a negative clock is not a time
+    ("9:75", np.nan, 1),
+    ("", np.nan, 0),            # blank cells are missing, not unparseable
+    ("   ", np.nan, 0),
+    ("abc", np.nan, 1),
+    ("#REF!", np.nan, 1),
+]
+# The same cell alone, in a column of H:MM strings and in a column of numbers,
+# so both fast paths and the TIME_PATTERN fallback are exercised
+CONTEXTS = {"alone": [], "clock column": ["09:00"] * 20, "number column": ["8.5"] * 20}
+
+@pytest.mark.parametrize("context", list(CONTEXTS))
+@pytest.mark.parametrize("text, expected, unparseable", TEXT_CASES)
+def test_parse_hours_text(text, expected, unparseable, context):
+    values = pd.Series(CONTEXTS[context] + [text], dtype=object)
+    hours, bad = parse_hours(values)
+    assert hours.dtype == np.float64
+    assert hours.iloc[-1] == pytest.approx(expected, nan_ok=True)
+    assert bad == unparseable
+
+@pytest.mark.parametrize("values, clock, expected", [
+    ([0.375, 0.75], True, [9.0, 18.0]),        # Excel day fractions in a clock column
+    ([0.0, 1.0], True, [0.0, 24.0]),
+    ([0.375, 1.25], True, [0.375, 1.25]),      # a value >= 1: these are hours, not fractions
+    ([0.375, 0.75], False, [0.375, 0.75]),     # durations are never scaled
+    ([-0.5, 0.5], True, [-0.5, 0.5]),
+])
+def test_parse_hours_excel_fractions(values, clock, expected):
+    hours, bad = parse_hours(pd.Series(values), clock=clock)
+    assert hours.tolist() == pytest.approx(expected)
+    assert bad == 0
+
+def test_parse_hours_time_objects():
+    values = pd.Series([datetime.time(9, 15), datetime.time(17, 45, 36), None, datetime.time(0, 0)])
+    hours, bad = parse_hours(values, clock=True)
+    assert hours.dtype == np.float64
+    assert hours.tolist() == pytest.approx([9.25, 17.76, np.nan, 0.0], nan_ok=True)
+    assert bad == 0
+
+def test_parse_hours_datetime_and_timedelta_columns():
+    stamps = pd.Series(pd.to_datetime(["2024-01-01 09:30:00", "2024-01-02 18:15:36", None]))
+    assert parse_hours(stamps, clock=True)[0].tolist() == pytest.approx([9.5, 18.26, np.nan], nan_ok=True)
+    spans = pd.Series(pd.to_timedelta(["1:30:00", "26:00:00"]))
+    assert parse_hours(spans)[0].tolist() == pytest.approx([1.5, 26.0])
+
+def test_preprocess_counts_unparseable_cells():
+    raw = pd.DataFrame({
+        'Employee ID': [1, 2, 3, 4],
+        'Avg. In Time': ["09:15", "junk", "", datetime.time(8, 30)],
+        'Avg. Office Hrs': ["8:00", "7.5", "n/a", None],
+    })
+    df = preprocess_data(raw)
+    assert df.attrs['unparseable'] == {'Avg. In Time': 1, 'Avg. Office Hrs': 1}
+    assert df['Avg. In Time'].tolist() == pytest.approx([9.25, 0.0, 0.0, 8.5])
+    assert df['Avg. Office Hrs'].tolist() == pytest.approx([8.0, 7.5, 0.0, 0.0])
@@ -0,0 +1,77 @@
+# tests/test_parallel_loader.py
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+import parallel_loader
+from parallel_loader import load_files, load_many
+from synthetic_data import write_synthetic_csv
+
+class BrokenPool:
+    """
+    Stands in for ProcessPoolExecutor: the first file loads in-process,
+    every later one fails as if its worker process had died
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.submitted == 0:
+            future.set_result(fn(*args))
+        else:
+            future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly"))
+        self.submitted += 1
+        return future
+
+def test_dead_worker_is_reported_per_file(tmp_path, monkeypatch):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = str(tmp_path / f"{name}.csv")
+        write_synthetic_csv(path, 20, 2, seed=len(paths))
+        paths.append(path)
+    monkeypatch.setattr(parallel_loader, "ProcessPoolExecutor", BrokenPool)
+
+    loaded = load_files(paths, workers=3, use_cache=False)
+    assert [result.path for result, _ in loaded] == paths
+    assert loaded[0][0].ok and len(loaded[0][1]) == 40
+    for result, frame in loaded[1:]:
+        assert frame is None
+        assert result.error.startswith("BrokenProcessPool")
+
+    frame, results = load_many(str(tmp_path), workers=3, use_cache=False)
+    assert len(frame) == 40
+    assert [result.ok for result in results] == [True, False, False]
+
+def test_unreadable_file_is_reported(tmp_path):
+    good, bad = str(tmp_path / "a.csv"), str(tmp_path / "b.xlsx")
+    write_synthetic_csv(good, 10, 1)
+    with open(bad, "w") as fh:
+        fh.write("not a workbook")
+    frame, results = load_many(str(tmp_path), workers=1, use_cache=False)
+    assert len(frame) == 10
+    assert results[0].ok and not results[1].ok
+
+def test_mixed_type_column_loads_with_workers(tmp_path):
+    raw = pd.DataFrame({
+        'Employee ID': [1, 2, 3],
+        'Employee Name': ['x', 5, 'y'],
+        'Avg. In Time': [9.0, 9.5, 10.0],
+    })
+    paths = [str(tmp_path / "a.xlsx"), str(tmp_path / "b.xlsx")]
+    for path in paths:
+        raw.to_excel(path, index=False)
+
+    serial = load_files(paths, workers=1, use_cache=False)
+    parallel = load_files(paths, workers=2, use_cache=False)
+    for (serial_result, serial_frame), (result, frame) in zip(serial, parallel):
+        assert serial_result.ok and result.ok, result.error
+        pd.testing.assert_frame_equal(frame, serial_frame)
@@ -0,0 +1,33 @@
+# tests/test_profiling.py
+import os
+import threading
+
+from profiling import Profiler
+
+def test_concurrent_prometheus_writes(tmp_path):
+    profiler = Profiler(enabled=True)
+    profiler.begin_rerun()
+    with profiler.stage("load"):
+        pass
+    profiler.end_rerun()
+    path = str(tmp_path / "horm.prom")
+    expected = profiler.prometheus_text()
+    errors = []
+
+    def write():
+        try:
+            for _ in range(50):
+                profiler.write_prometheus(path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == expected
+    assert os.listdir(tmp_path) == ["horm.prom"]
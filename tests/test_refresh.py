@@ -0,0 +1,78 @@
+# tests/test_refresh.py
+import pytest
+
+import refresh as refresh_module
+from data_processing import EmployeeIndex, get_employee_kpis
+from refresh import IncrementalDataset
+from synthetic_data import write_synthetic_csv
+
+def _failing_load(*args, **kwargs):
+    raise MemoryError("simulated")
+
+def test_failed_refresh_keeps_snapshot_and_retries(tmp_path, monkeypatch):
+    write_synthetic_csv(str(tmp_path / "a.csv"), 30, 2, seed=1)
+    dataset = IncrementalDataset(str(tmp_path), use_cache=False, workers=1)
+    dataset.refresh()
+    version, frame, _ = dataset.snapshot()
+    assert dataset.ready and len(frame) == 60
+
+    write_synthetic_csv(str(tmp_path / "b.csv"), 10, 2, seed=2)
+    monkeypatch.setattr(refresh_module, "load_files", _failing_load)
+    with pytest.raises(MemoryError):
+        dataset.start_refresh().result(timeout=30)
+    assert dataset.last_error == "MemoryError: simulated"
+    assert dataset.snapshot()[0] == version
+
+    monkeypatch.undo()
+    changes = dataset.refresh()
+    assert [path.endswith("b.csv") for path in changes.added] == [True]
+    assert dataset.last_error is None
+    assert len(dataset.snapshot()[1]) == 80
+
+def test_failed_first_load_is_not_ready(tmp_path, monkeypatch):
+    write_synthetic_csv(str(tmp_path / "a.csv"), 5, 1)
+    dataset = IncrementalDataset(str(tmp_path), use_cache=False, workers=1)
+    monkeypatch.setattr(refresh_module, "load_files", _failing_load)
+    with pytest.raises(MemoryError):
+        dataset.refresh()
+    assert not dataset.ready
+    assert dataset.snapshot()[1].empty
+
+def test_incremental_kpis_equal_scan_of_merged_frame(tmp_path):
+    write_synthetic_csv(str(tmp_path / "a.csv"), 300, 4, seed=1)
+    dataset = IncrementalDataset(str(tmp_path), use_cache=False, workers=1)
+    dataset.refresh()
+    # Appended export (fold onto the running sums), then a changed one (re-fold)
+    write_synthetic_csv(str(tmp_path / "b.csv"), 300, 3, seed=2)
+    dataset.refresh()
+    for rewrite in (False, True):
+        if rewrite:
+            write_synthetic_csv(str(tmp_path / "a.csv"), 300, 5, seed=3)
+            dataset.refresh()
+        _, frame, kpi_table = dataset.snapshot()
+        index = EmployeeIndex(kpi_table)
+        assert len(index) == frame['Employee ID'].nunique()
+        for emp_id in frame['Employee ID'].unique():
+            assert index.get_kpis(emp_id) == get_employee_kpis(frame, emp_id), emp_id
+
+def test_failure_after_kpi_fold_leaves_dataset_unchanged(tmp_path, monkeypatch):
+    write_synthetic_csv(str(tmp_path / "a.csv"), 20, 3, seed=1)
+    dataset = IncrementalDataset(str(tmp_path), use_cache=False, workers=1)
+    dataset.refresh()
+    before = dataset.kpi_table.copy()
+
+    # Appended export: the fold happens, then building the merged frame fails
+    write_synthetic_csv(str(tmp_path / "b.csv"), 20, 1, seed=2)
+    monkeypatch.setattr(refresh_module, "concat_frames", _failing_load)
+    with pytest.raises(MemoryError):
+        dataset.refresh()
+    assert dataset.kpis.records == 60 and dataset.files == [str(tmp_path / "a.csv")]
+    assert dataset.kpis.result().equals(before)
+
+    monkeypatch.undo()
+    dataset.refresh()
+    _, frame, kpi_table = dataset.snapshot()
+    assert dataset.kpis.records == len(frame) == 80
+    index = EmployeeIndex(kpi_table)
+    for emp_id in frame['Employee ID'].unique():
+        assert index.get_kpis(emp_id) == get_employee_kpis(frame, emp_id), emp_id
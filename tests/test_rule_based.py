@@ -0,0 +1,68 @@
+# tests/test_rule_based.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing import aggregate_employee_kpis, get_employee_kpis, preprocess_data
+from rule_based import decode_rule_mask, evaluate_rule_masks, recommend_action, recommend_actions_batch
+from synthetic_data import generate_attendance
+
+@pytest.fixture(scope="module")
+def dirty_frame():
+    # Junk strings, blanks and NaNs in every numeric column, bad Employee IDs
+    return preprocess_data(generate_attendance(2000, 3, seed=11, dirty_rate=0.05))
+
+def test_batch_matches_recommend_action(dirty_frame):
+    batch = recommend_actions_batch(dirty_frame)
+    assert len(batch) == dirty_frame['Employee ID'].nunique()
+    for emp_id, mask in zip(batch['Employee ID'], batch['Rule Mask']):
+        assert decode_rule_mask(mask) == recommend_action(get_employee_kpis(dirty_frame, emp_id)), emp_id
+
+def test_masks_match_on_raw_kpi_values():
+    # KPI tables that were not preprocessed: NaNs, junk strings, numeric strings,
+    # missing values in nullable columns and non-bool Billed values
+    kpis = pd.DataFrame({
+        'Employee ID': range(8),
+        'Avg. In Time': [9.6, np.nan, '9.2', 'abc', None, 9.0, 8.5, 10.0],
+        'Avg. Out Time': [16.0, 18.0, np.nan, '17', 'x', 17.0, 18.0, 16.5],
+        'Avg. Office Hrs': pd.array([6.5, 7.5, None, 8.0, 9.0, 8.5, 7.99, 5.0], dtype='Float64'),
+        'Avg. Break Hrs': [1.2, 0.5, np.nan, 0.5, 0.5, 0.5, 2.0, 0.0],
+        'Full Day Leave': [4, 2, 0, np.nan, 1, 0, 0, 5],
+        'Half Day Leave': [3, 2, 1, 0, 0, np.nan, 0, 1],
+        'Billed': [True, False, None, 'Billed', 0, 1, np.nan, ''],
+    })
+    masks = evaluate_rule_masks(kpis)
+    for mask, (_, row) in zip(masks, kpis.iterrows()):
+        assert decode_rule_mask(mask) == recommend_action(row.drop('Employee ID').to_dict()), row['Employee ID']
+
+def test_masks_cover_aggregated_table(dirty_frame):
+    kpis = aggregate_employee_kpis(dirty_frame)
+    np.testing.assert_array_equal(evaluate_rule_masks(kpis), recommend_actions_batch(dirty_frame)['Rule Mask'])
+
+def test_batch_matches_recommend_action_on_thresholds():
+    # One-decimal records around the rule cutoffs, so many means land on a
+    # threshold where a last-bit difference would flip the rule
+    rng = np.random.default_rng(3)
+    employees, records = 2000, 7
+    around = lambda cutoff: np.round(cutoff + rng.integers(-3, 4, employees * records) / 10, 1)
+    df = preprocess_data(pd.DataFrame({
+        'Employee ID': np.repeat(np.arange(employees), records),
+        'Avg. In Time': around(9.0),
+        'Avg. Out Time': around(17.0),
+        'Avg. Office Hrs': around(8.0),
+        'Avg. Break Hrs': around(1.0),
+        'Avg. Cafeteria Hrs': around(0.8),
+        'Avg. OOO Hrs': around(1.5),
+        'Full Day Leave': 0,
+        'Half Day Leave': 0,
+        'Billed': True,
+    }))
+    batch = recommend_actions_batch(df)
+    kpis = aggregate_employee_kpis(df).set_index('Employee ID')
+    on_threshold = 0
+    for emp_id, mask in zip(batch['Employee ID'], batch['Rule Mask']):
+        expected = get_employee_kpis(df, emp_id)
+        assert kpis.loc[emp_id].to_dict() == expected, emp_id
+        assert decode_rule_mask(mask) == recommend_action(expected), emp_id
+        on_threshold += expected['Avg. Out Time'] == 17.0
+    assert on_threshold > 50
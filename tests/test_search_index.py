@@ -0,0 +1,41 @@
+# tests/test_search_index.py
+import pandas as pd
+
+from search_index import SearchIndex
+
+NAMES = ["John Smith", "Jane Smythe", "Priya Kumar", "Rahul Sharma", "Anita Desai",
+         "Vikram Singh", "Asha Sharma", "john  SMITH", "Johan Schmidt", None]
+
+def _index(names=NAMES) -> SearchIndex:
+    return SearchIndex(pd.DataFrame({
+        "Employee ID": range(100, 100 + len(names)),
+        "Employee Name": names,
+        "Account code": ["AC1", "AC2"] * (len(names) // 2) + ["AC1"] * (len(names) % 2),
+    }))
+
+def _names(index: SearchIndex, rows) -> list:
+    return [index.names[row] for row in rows]
+
+def test_transposed_letters_find_the_name():
+    index = _index()
+    assert _names(index, index.fuzzy("Jhon Smtih")[:2]) == ["John Smith", "john  SMITH"]
+    assert _names(index, index.fuzzy("priay kumar")[:1]) == ["Priya Kumar"]
+
+def test_prefix_matches_any_word_then_fuzzy_tops_up():
+    index = _index()
+    assert _names(index, index.prefix("sha")) == ["Rahul Sharma", "Asha Sharma"]
+    results = index.search("smith")
+    assert [(r["Employee Name"], r["match"]) for r in results[:2]] == [
+        ("John Smith", "prefix"), ("john  SMITH", "prefix")]
+    assert {r["match"] for r in results[2:]} <= {"fuzzy"}
+    assert index.search("zzzz") == []
+
+def test_fuzzy_with_frequent_trigrams_in_a_large_index():
+    # Many names share the same surname: its trigrams get bitsets
+    names = [f"Person{i} Kumar" for i in range(400)] + ["Priya Kumar"]
+    index = _index(names)
+    assert (index.trigram_bitset >= 0).any()
+    assert _names(index, index.fuzzy("priay kumar")[:1]) == ["Priya Kumar"]
+    found = _names(index, index.fuzzy("kumar", limit=5))
+    assert found[0] == "Priya Kumar" and len(found) == 5
+    assert all(name.endswith(" Kumar") for name in found)
@@ -0,0 +1,73 @@
+# tests/test_sqlite_store.py
+import threading
+
+import pandas as pd
+import pytest
+
+from data_processing import build_employee_index, preprocess_data
+from sqlite_store import SQLiteBackend
+from synthetic_data import write_synthetic_csv
+
+def _backend(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir(exist_ok=True)
+    return data, SQLiteBackend(str(tmp_path / "db" / "attendance.sqlite"), str(data), chunksize=25)
+
+def test_background_sync_matches_in_memory_index(tmp_path):
+    data, backend = _backend(tmp_path)
+    write_synthetic_csv(str(data / "a.csv"), 20, 3, seed=1)
+    write_synthetic_csv(str(data / "b.csv"), 10, 2, seed=2)
+    assert not backend.ready
+
+    changes = backend.start_sync().result(timeout=60)
+    assert len(changes.added) == 2 and backend.ready and backend.records == 80
+
+    frames = [pd.read_csv(data / name, low_memory=False) for name in ("a.csv", "b.csv")]
+    index = build_employee_index(preprocess_data(pd.concat(frames, ignore_index=True)))
+    for employee_id in index.table["Employee ID"].head(5):
+        expected = index.get_kpis(employee_id)
+        actual = backend.get_kpis(employee_id)
+        for key, value in expected.items():
+            if isinstance(value, float):
+                assert actual[key] == pytest.approx(value, nan_ok=True)
+            else:
+                assert actual[key] == value
+    assert not backend.start_sync().result(timeout=60)
+
+def test_readers_see_previous_version_during_sync(tmp_path, monkeypatch):
+    data, backend = _backend(tmp_path)
+    write_synthetic_csv(str(data / "a.csv"), 10, 2, seed=1)
+    backend.sync()
+    version = backend.version
+
+    write_synthetic_csv(str(data / "b.csv"), 10, 2, seed=2)
+    started, release = threading.Event(), threading.Event()
+    ingest = SQLiteBackend._ingest
+
+    def paused_ingest(self, conn, path, sha256):
+        ingest(self, conn, path, sha256)
+        started.set()
+        release.wait(timeout=30)
+
+    monkeypatch.setattr(SQLiteBackend, "_ingest", paused_ingest)
+    future = backend.start_sync()
+    assert started.wait(timeout=30)
+    assert backend.version == version
+    assert backend._connect().execute("SELECT COUNT(*) FROM records").fetchone()[0] == 20
+    release.set()
+    future.result(timeout=60)
+    assert backend.version != version and backend.records == 40
+
+def test_bad_file_is_skipped_alone_and_retried_once_fixed(tmp_path):
+    data, backend = _backend(tmp_path)
+    write_synthetic_csv(str(data / "a.csv"), 10, 2, seed=1)
+    (data / "b.csv").write_bytes(b"\xff\xfe\x00 not a csv")
+    backend.sync()
+    assert backend.records == 20
+    assert list(backend.errors) == [str(data / "b.csv")]
+    assert not backend.sync()
+
+    write_synthetic_csv(str(data / "b.csv"), 5, 2, seed=2)
+    changes = backend.sync()
+    assert [path.endswith("b.csv") for path in changes.added] == [True]
+    assert backend.records == 30 and not backend.errors
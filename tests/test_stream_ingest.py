@@ -0,0 +1,42 @@
+# tests/test_stream_ingest.py
+import pandas as pd
+import pytest
+
+from data_processing import aggregate_employee_kpis, preprocess_data
+from stream_ingest import iter_preprocessed_chunks, stream_ingest
+from synthetic_data import generate_attendance
+
+def _write(raw: pd.DataFrame, path) -> str:
+    if path.suffix == ".csv":
+        raw.to_csv(path, index=False)
+    else:
+        raw.to_excel(path, index=False)
+    return str(path)
+
+@pytest.mark.parametrize("suffix", [".csv", ".xlsx"])
+@pytest.mark.parametrize("chunksize", [7, 64])
+def test_streamed_kpis_equal_aggregate(tmp_path, suffix, chunksize):
+    # Employees spread over many chunks, dirty cells included
+    raw = generate_attendance(60, 5, seed=4, dirty_rate=0.05).sample(frac=1, random_state=1)
+    path = _write(raw, tmp_path / f"export{suffix}")
+    reader = pd.read_csv if suffix == ".csv" else pd.read_excel
+    expected = aggregate_employee_kpis(preprocess_data(reader(path)), include_profile=True)
+
+    accumulator, report = stream_ingest(path, chunksize=chunksize)
+    assert report.chunks > 1
+    pd.testing.assert_frame_equal(accumulator.result(), expected, check_dtype=False, check_exact=True)
+
+def test_day_fraction_scaling_is_decided_once_per_file(tmp_path):
+    # Decimal clock hours; a later chunk happens to hold only small values
+    raw = pd.DataFrame({
+        'Employee ID': range(8),
+        'Avg. In Time': [9.0, 9.5, 8.75, 10.0, 0.5, 0.75, 0.25, 1.0],
+        'Avg. Out Time': [0.75, 0.7, 0.8, 0.72, 0.75, 0.7, 0.8, 0.72],
+    })
+    path = _write(raw, tmp_path / "export.csv")
+    chunks = list(iter_preprocessed_chunks(path, chunksize=4))
+    assert [chunk.attrs['day_fractions'] for chunk in chunks] == [
+        {'Avg. In Time': False, 'Avg. Out Time': True}] * 2
+    streamed = pd.concat(chunks, ignore_index=True)
+    assert streamed['Avg. In Time'].tolist() == raw['Avg. In Time'].tolist()
+    assert streamed['Avg. Out Time'].tolist() == pytest.approx((raw['Avg. Out Time'] * 24).tolist())
@@ -0,0 +1,27 @@
+# tests/test_swipe_ingest.py
+import pandas as pd
+import pytest
+
+from swipe_ingest import count_swipe_events, ingest_swipes
+from synthetic_data import generate_swipe_events
+
+def _sorted(records: pd.DataFrame) -> pd.DataFrame:
+    return records.sort_values(['Employee ID', 'Period'], ignore_index=True)
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_file_source_spills_to_buckets(tmp_path, suffix):
+    events = generate_swipe_events(60, days=5, seed=3)
+    path = tmp_path / f"swipes{suffix}"
+    if suffix == ".csv":
+        events.to_csv(path, index=False)
+    else:
+        events.to_parquet(path, index=False)
+    assert count_swipe_events(str(path)) == len(events)
+
+    records, report = ingest_swipes(str(path), chunksize=400, bucket_events=len(events) // 4)
+    assert report.buckets > 1
+    assert report.max_bucket_events < len(events)
+
+    expected, in_memory = ingest_swipes(events, bucket_events=len(events) + 1)
+    assert in_memory.buckets == 1
+    pd.testing.assert_frame_equal(_sorted(records), _sorted(expected), check_dtype=False)
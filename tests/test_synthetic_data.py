@@ -0,0 +1,16 @@
+# tests/test_synthetic_data.py
+import pytest
+
+from synthetic_data import generate_attendance, iter_synthetic_chunks
+
+@pytest.mark.parametrize("chunk_employees", [1, 333, 500, 1000, 2500])
+def test_output_independent_of_chunk_size(chunk_employees):
+    expected = generate_attendance(2000, 3, seed=7, chunk_employees=2000)
+    assert generate_attendance(2000, 3, seed=7, chunk_employees=chunk_employees).equals(expected)
+
+def test_chunks_hold_whole_employees():
+    chunks = list(iter_synthetic_chunks(1200, 4, seed=1, dirty_rate=0.0, chunk_employees=500))
+    assert [len(chunk) for chunk in chunks] == [2000, 2000, 800]
+    assert all(chunk.index[0] == 0 for chunk in chunks)
+    firsts = [chunk['Employee ID'].iloc[0] for chunk in chunks]
+    assert firsts == [1, 501, 1001]